@@ -1,16 +1,34 @@
 """交互式聊天脚本。"""
-import requests
+import json
+from typing import Iterator
+
+import httpx
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# 复用同一个连接池，多轮对话之间保持 keep-alive，避免每条消息重新握手
+CLIENT = httpx.Client(base_url=BASE_URL, timeout=60)
+
 def chat(message: str, user_id: str = "user1") -> dict:
     """发送聊天请求。"""
-    response = requests.post(
-        f"{BASE_URL}/chat",
+    response = CLIENT.post(
+        "/chat",
         json={"user_id": user_id, "message": message}
     )
     return response.json()
 
+def chat_stream(message: str, user_id: str = "user1") -> Iterator[dict]:
+    """发送流式聊天请求，逐个产出服务端推送的SSE事件。"""
+    with CLIENT.stream(
+        "POST",
+        "/chat/stream",
+        json={"user_id": user_id, "message": message}
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                yield json.loads(line[len("data: "):])
+
 def main():
     print("=" * 50)
     print("明禾陪伴 - 心理资讯大师")
@@ -20,22 +38,31 @@ def main():
     
     user_id = input("请输入用户名: ").strip() or "user1"
     
-    while True:
-        message = input("\n你: ").strip()
-        
-        if message in ["quit", "退出", "q"]:
-            print("再见！祝你一切安好。")
-            break
-        
-        if not message:
-            continue
-        
-        try:
-            result = chat(message, user_id)
-            print(f"\n明禾: {result['response']}")
-            print(f"[意图: {result['intent']} | 风险: {result['risk_level']}]")
-        except Exception as e:
-            print(f"错误: {e}")
+    try:
+        while True:
+            message = input("\n你: ").strip()
+            
+            if message in ["quit", "退出", "q"]:
+                print("再见！祝你一切安好。")
+                break
+            
+            if not message:
+                continue
+            
+            try:
+                # 边生成边打印，不必等待完整回复
+                print("\n明禾: ", end="", flush=True)
+                for event in chat_stream(message, user_id):
+                    if "delta" in event:
+                        print(event["delta"], end="", flush=True)
+                    elif event.get("done"):
+                        print(f"\n[意图: {event['intent']} | 风险: {event['risk_level']}]")
+                    elif "error" in event:
+                        print(f"\n错误: {event['error']}")
+            except Exception as e:
+                print(f"错误: {e}")
+    finally:
+        CLIENT.close()
 
 if __name__ == "__main__":
     main()
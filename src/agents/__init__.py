@@ -5,9 +5,11 @@ from src.agents.psychology_master import (
     AgentResponse,
     get_psychology_master_agent,
 )
+from src.agents.semantic_cache import SemanticCache
 
 __all__ = [
     "PsychologyMasterAgent",
     "AgentResponse",
     "get_psychology_master_agent",
+    "SemanticCache",
 ]
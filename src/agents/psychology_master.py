@@ -1,14 +1,19 @@
 """Psychology Master Agent - 心理资讯大师."""
 
+import asyncio
+import hashlib
 import logging
-import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 
-from langchain_core.messages import HumanMessage, SystemMessage
+import numpy as np
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
+from src.core.config import settings
 from src.core.constants import (
+    INTENT_KEYWORDS,
     IntentType,
     RiskLevel,
     InterventionType,
@@ -21,18 +26,39 @@ from src.core.prompt import (
     EMPATHY_RESPONSE_PROMPT,
     RAG_PROMPT_TEMPLATE,
 )
-from src.tools.crisis import CrisisDetector, get_crisis_detector
+from src.agents.semantic_cache import Embedder, SemanticCache
+from src.tools.crisis import (
+    CrisisDetectionResult,
+    CrisisDetector,
+    get_crisis_detector,
+)
+from src.tools.keyword_matcher import KeywordMatcher
 from src.tools.rag import KnowledgeBaseRetriever, get_knowledge_retriever
 from src.tools.assessment import PsychologicalAssessmentTool, get_assessment_tool
-from src.memory.system import MemorySystem, get_memory_system
+from src.memory.system import MemorySystem, get_memory_system, new_session_id
 from src.llm.client import ChatDeepSeek, get_llm_client
 
 logger = logging.getLogger(__name__)
 
+# 允许语义缓存的意图：回应不依赖用户个人情况，近义问题可共享答案。
+# 求助、危机等意图必须逐条生成，避免跨用户串用回应。
+SEMANTIC_CACHE_INTENTS = (IntentType.KNOWLEDGE_QUERY, IntentType.EMOTIONAL_SUPPORT)
+
+# 系统提示词消息在所有LLM调用间共享，只构建一次
+_SYS_MSG = SystemMessage(content=PSYCHOLOGY_MASTER_SYSTEM_PROMPT)
+
+# 干预练习类型关键词（小写），并入统一关键词扫描，选择练习时无需再次扫描消息
+_MINDFULNESS_KEYWORDS = frozenset({"冥想", "正念"})
+_BREATHING_KEYWORDS = frozenset({"呼吸", "放松"})
+_COGNITIVE_KEYWORDS = frozenset({"认知", "cbt", "思维"})
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentResponse:
-    """Agent响应。"""
+    """Agent响应。
+
+    每个对话请求都会创建，使用 __slots__ 省去实例 __dict__。
+    """
 
     content: str
     intent: IntentType
@@ -51,6 +77,25 @@ class AgentResponse:
         }
 
 
+@dataclass(slots=True)
+class _LLMRequest:
+    """待发送给LLM的请求。"""
+
+    prompt: str
+    fallback: str  # LLM不可用或调用失败时的备用响应
+    intent: Optional[IntentType] = None  # 用于选择语义缓存
+    query: Optional[str] = None  # 用户原始消息，语义缓存的查询文本
+
+
+@dataclass(slots=True)
+class _CacheSlot:
+    """缓存未命中时记录的回填位置。"""
+
+    key: str = ""
+    semantic_cache: Optional[SemanticCache] = None
+    vector: Optional[np.ndarray] = None
+
+
 class PsychologyMasterAgent:
     """心理资讯大师Agent。
 
@@ -69,6 +114,8 @@ class PsychologyMasterAgent:
         assessment_tool: Optional[PsychologicalAssessmentTool] = None,
         memory_system: Optional[MemorySystem] = None,
         llm_client: Optional[ChatDeepSeek] = None,
+        response_cache_size: int = 1024,
+        embedder: Optional[Embedder] = None,
     ):
         """初始化Agent。
 
@@ -78,6 +125,8 @@ class PsychologyMasterAgent:
             assessment_tool: 心理评估工具
             memory_system: 记忆系统
             llm_client: LLM客户端（GLM-4.7 Flash）
+            response_cache_size: LLM响应缓存容量（仅temperature=0时启用）
+            embedder: 文本向量化函数，提供时为近义查询启用语义缓存
         """
         self.crisis_detector = crisis_detector or get_crisis_detector()
         self.knowledge_retriever = knowledge_retriever or get_knowledge_retriever()
@@ -85,8 +134,38 @@ class PsychologyMasterAgent:
         self.memory_system = memory_system or get_memory_system()
         self.llm_client = llm_client
 
+        # 危机、意图和干预练习关键词合并为一个自动机，每条消息只扫描一次
+        self._keyword_matcher = KeywordMatcher(
+            self.crisis_detector.scan_keywords.union(
+                *INTENT_KEYWORDS.values(),
+                _MINDFULNESS_KEYWORDS,
+                _BREATHING_KEYWORDS,
+                _COGNITIVE_KEYWORDS,
+            )
+        )
+
+        # LLM响应LRU缓存: sha256(system + user) -> 响应文本
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+        self._response_cache_size = response_cache_size
+        self.cache_stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "semantic_hits": 0,
+            "coalesced": 0,
+        }
+
+        # 进行中的异步LLM请求: 提示词哈希 -> Future，相同请求合并为一次调用
+        self._inflight: Dict[str, asyncio.Future[str]] = {}
+
+        # 语义缓存: 按意图隔离，近义查询复用响应
+        self._semantic_caches: Dict[IntentType, SemanticCache] = (
+            {intent: SemanticCache(embedder) for intent in SEMANTIC_CACHE_INTENTS}
+            if embedder
+            else {}
+        )
+
         # 生成session_id
-        self.current_session_id = str(uuid.uuid4())
+        self.current_session_id = new_session_id()
 
         logger.info("Psychology Master Agent initialized")
 
@@ -109,96 +188,230 @@ class PsychologyMasterAgent:
         # 使用或创建会话ID
         session_id = session_id or self.current_session_id
 
-        logger.info(
-            f"Processing message: user_id={user_id}, "
-            f"session_id={session_id}, message={message[:50]}..."
+        logger.debug(
+            "Processing message: user_id=%s, session_id=%s, message=%s...",
+            user_id,
+            session_id,
+            message[:50],
         )
 
         # 1. 危机检测（最高优先级）
-        crisis_result = self.crisis_detector.detect(message)
+        found = self._keyword_matcher.find(message.lower())
+        crisis_result = self.crisis_detector.detect_from_keywords(found)
+        if crisis_result.detected:
+            return self._respond_to_crisis(user_id, session_id, message, crisis_result)
+
+        # 2. 意图识别 + 3. 根据意图处理
+        intent, planned, tools_used = self._plan_response(message, found)
+        content = planned if isinstance(planned, str) else self._complete(planned)
+
+        # 4. 保存交互到记忆
+        return self._finish_response(
+            user_id, session_id, message, intent, crisis_result, content, tools_used
+        )
+
+    async def achat(
+        self,
+        user_id: str,
+        message: str,
+        session_id: Optional[str] = None,
+    ) -> AgentResponse:
+        """异步处理用户消息。
 
-        tools_used: List[str] = ["crisis_detection"]
+        与 chat 流程相同，但以 await 方式调用LLM，
+        等待网络响应期间不阻塞事件循环。
+
+        Args:
+            user_id: 用户ID
+            message: 用户消息
+            session_id: 会话ID（可选）
 
-        # 如果检测到危机，立即返回危机响应
+        Returns:
+            AgentResponse: Agent响应
+        """
+        session_id = session_id or self.current_session_id
+
+        logger.debug(
+            "Processing message: user_id=%s, session_id=%s, message=%s...",
+            user_id,
+            session_id,
+            message[:50],
+        )
+
+        found = self._keyword_matcher.find(message.lower())
+        crisis_result = self.crisis_detector.detect_from_keywords(found)
         if crisis_result.detected:
-            crisis_response = self.crisis_detector.get_crisis_response(crisis_result)
-
-            # 保存交互
-            self.memory_system.add_user_message(session_id, user_id, message)
-            self.memory_system.add_assistant_message(
-                session_id,
-                user_id,
-                crisis_response,
-                intent=IntentType.CRISIS_SIGNAL.value,
-            )
+            return self._respond_to_crisis(user_id, session_id, message, crisis_result)
+
+        intent, planned, tools_used = self._plan_response(message, found)
+        content = (
+            planned if isinstance(planned, str) else await self._acomplete(planned)
+        )
+
+        return self._finish_response(
+            user_id, session_id, message, intent, crisis_result, content, tools_used
+        )
+
+    async def astream_chat(
+        self,
+        user_id: str,
+        message: str,
+        session_id: Optional[str] = None,
+    ) -> AsyncIterator[Union[str, AgentResponse]]:
+        """流式处理用户消息。
+
+        与 achat 流程相同，但LLM生成的文本按增量片段逐个产出，
+        客户端无需等待完整响应即可开始展示。固定响应和危机响应
+        作为单个片段产出。
+
+        Args:
+            user_id: 用户ID
+            message: 用户消息
+            session_id: 会话ID（可选）
+
+        Yields:
+            文本增量片段（str），最后产出完整的 AgentResponse
+        """
+        session_id = session_id or self.current_session_id
+
+        logger.debug(
+            "Streaming message: user_id=%s, session_id=%s, message=%s...",
+            user_id,
+            session_id,
+            message[:50],
+        )
 
-            return AgentResponse(
-                content=crisis_response,
-                intent=IntentType.CRISIS_SIGNAL,
-                risk_level=crisis_result.risk_level,
-                tools_used=tools_used,
-                metadata={
-                    "crisis_category": crisis_result.category,
-                    "matched_keywords": ",".join(crisis_result.matched_keywords),
-                },
+        found = self._keyword_matcher.find(message.lower())
+        crisis_result = self.crisis_detector.detect_from_keywords(found)
+        if crisis_result.detected:
+            response = self._respond_to_crisis(
+                user_id, session_id, message, crisis_result
             )
+            yield response.content
+            yield response
+            return
+
+        intent, planned, tools_used = self._plan_response(message, found)
+        if isinstance(planned, str):
+            content = planned
+            yield content
+        else:
+            chunks: List[str] = []
+            async for delta in self._astream_complete(planned):
+                chunks.append(delta)
+                yield delta
+            content = "".join(chunks)
+
+        # 完整文本生成后再写入记忆
+        yield self._finish_response(
+            user_id, session_id, message, intent, crisis_result, content, tools_used
+        )
+
+    def _respond_to_crisis(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        crisis_result: CrisisDetectionResult,
+    ) -> AgentResponse:
+        """生成危机响应并保存交互。"""
+        crisis_response = self.crisis_detector.get_crisis_response(crisis_result)
+
+        # 保存交互
+        self.memory_system.add_turn(
+            session_id,
+            user_id,
+            message,
+            crisis_response,
+            intent=IntentType.CRISIS_SIGNAL.value,
+        )
+
+        return AgentResponse(
+            content=crisis_response,
+            intent=IntentType.CRISIS_SIGNAL,
+            risk_level=crisis_result.risk_level,
+            tools_used=["crisis_detection"],
+            metadata={
+                "crisis_category": crisis_result.category,
+                "matched_keywords": ",".join(crisis_result.matched_keywords),
+            },
+        )
 
-        # 2. 意图识别
-        intent = self._classify_intent(message)
-        tools_used.append("intent_classification")
+    def _plan_response(
+        self, message: str, found: Set[str]
+    ) -> Tuple[IntentType, Union[str, _LLMRequest], List[str]]:
+        """识别意图并确定响应方式。
 
-        # 3. 根据意图处理
-        response_content: str
-        metadata: Dict[str, Any] = {}
+        Args:
+            message: 用户消息
+            found: 消息中扫描出的关键词
+
+        Returns:
+            (意图, 固定响应或待发送的LLM请求, 使用的工具列表)
+        """
+        intent = self._classify_intent(message, found)
+        tools_used: List[str] = ["crisis_detection", "intent_classification"]
+        planned: Union[str, _LLMRequest]
 
         if intent == IntentType.KNOWLEDGE_QUERY:
             # 知识问答 - 使用RAG
             context = self._get_rag_context(message)
-            response_content = self._generate_knowledge_response(message, context)
+            planned = self._knowledge_request(message, context)
             tools_used.append("rag_retrieval")
 
         elif intent == IntentType.EMOTIONAL_SUPPORT:
             # 情感支持 - 共情对话
-            response_content = self._generate_empathy_response(message)
+            planned = self._empathy_request(message)
             tools_used.append("empathy_response")
 
         elif intent == IntentType.HELP_SEEKING:
             # 寻求帮助 - 可能触发评估
-            response_content = self._generate_help_response(message)
+            planned = self._generate_help_response(message)
 
         elif intent == IntentType.PRACTICE_REQUEST:
             # 练习请求 - 引导干预
-            response_content = self._generate_intervention_response(message)
+            planned = self._generate_intervention_response(message, found)
             tools_used.append("intervention")
 
         else:
             # 一般对话
-            response_content = self._generate_general_response(message)
+            planned = self._general_request(message)
 
-        # 4. 保存交互到记忆
-        self.memory_system.add_user_message(session_id, user_id, message)
-        self.memory_system.add_assistant_message(
-            session_id,
-            user_id,
-            response_content,
-            intent=intent.value,
+        return intent, planned, tools_used
+
+    def _finish_response(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        intent: IntentType,
+        crisis_result: CrisisDetectionResult,
+        content: str,
+        tools_used: List[str],
+    ) -> AgentResponse:
+        """保存交互到记忆并构建响应。"""
+        self.memory_system.add_turn(
+            session_id, user_id, message, content, intent=intent.value
         )
 
         logger.info(
-            f"Response generated: intent={intent.value}, "
-            f"risk={crisis_result.risk_level.value}, "
-            f"tools={tools_used}"
+            "Response generated: intent=%s, risk=%s, tools=%s",
+            intent.value,
+            crisis_result.risk_level.value,
+            tools_used,
         )
 
         return AgentResponse(
-            content=response_content,
+            content=content,
             intent=intent,
             risk_level=crisis_result.risk_level,
             tools_used=tools_used,
-            metadata=metadata,
+            metadata={},
         )
 
-    def _classify_intent(self, message: str) -> IntentType:
+    def _classify_intent(
+        self, message: str, found: Optional[Set[str]] = None
+    ) -> IntentType:
         """识别用户意图。
 
         这是一个简化版的意图分类。
@@ -206,170 +419,323 @@ class PsychologyMasterAgent:
 
         Args:
             message: 用户消息
+            found: 已扫描出的关键词（未提供时重新扫描消息）
 
         Returns:
             IntentType: 识别的意图
         """
-        message_lower = message.lower()
-
-        # 知识问答关键词
-        knowledge_keywords = ["是什么", "为什么", "如何", "怎么", "什么是", "解释"]
-        if any(kw in message_lower for kw in knowledge_keywords):
-            return IntentType.KNOWLEDGE_QUERY
-
-        # 练习请求关键词
-        practice_keywords = [
-            "练习",
-            "冥想",
-            "深呼吸",
-            "放松",
-            "正念",
-            "帮我",
-            "教我",
-            "我想做",
-            "可以教",
-        ]
-        if any(kw in message_lower for kw in practice_keywords):
-            return IntentType.PRACTICE_REQUEST
-
-        # 寻求帮助关键词
-        help_keywords = [
-            "怎么办",
-            "不知道怎么",
-            "求助",
-            "帮我",
-            "很烦",
-            "很痛苦",
-            "难过",
-            "抑郁",
-            "焦虑",
-        ]
-        if any(kw in message_lower for kw in help_keywords):
-            return IntentType.HELP_SEEKING
-
-        # 情感倾诉（较长且包含情感词）
-        emotion_keywords = [
-            "心情",
-            "感受",
-            "情绪",
-            "很难过",
-            "很伤心",
-            "压力",
-            "烦恼",
-            "倾诉",
-            "说说",
-        ]
-        if any(kw in message_lower for kw in emotion_keywords):
-            return IntentType.EMOTIONAL_SUPPORT
+        if found is None:
+            found = self._keyword_matcher.find(message.lower())
+
+        # 按优先级返回第一个命中的意图
+        for intent, keywords in INTENT_KEYWORDS.items():
+            if not found.isdisjoint(keywords):
+                return intent
 
         return IntentType.GENERAL_CHAT
 
+    def _complete(self, request: _LLMRequest) -> str:
+        """调用LLM完成请求，失败或未配置LLM时返回备用响应。
+
+        Args:
+            request: LLM请求
+
+        Returns:
+            str: 响应内容
+        """
+        if not self.llm_client:
+            return request.fallback
+
+        try:
+            cached, slot = self._lookup_cache(request)
+            if cached is not None:
+                return cached
+            response = self.llm_client.invoke(self._build_messages(request))
+            return self._store_response(slot, self._extract_text(response))
+        except Exception as e:
+            logger.warning("LLM调用失败，使用备用响应: %s", e)
+            return request.fallback
+
+    async def _acomplete(self, request: _LLMRequest) -> str:
+        """异步调用LLM完成请求，失败或未配置LLM时返回备用响应。
+
+        Args:
+            request: LLM请求
+
+        Returns:
+            str: 响应内容
+        """
+        if not self.llm_client:
+            return request.fallback
+
+        try:
+            cached, slot = self._lookup_cache(request)
+            if cached is not None:
+                return cached
+
+            key = slot.key or self._prompt_key(request.prompt)
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                # 相同请求正在进行中，等待其结果而不是重复调用
+                self.cache_stats["coalesced"] += 1
+                return await asyncio.shield(inflight)
+
+            return await self._ainvoke_single_flight(key, request, slot)
+        except Exception as e:
+            logger.warning("LLM调用失败，使用备用响应: %s", e)
+            return request.fallback
+
+    async def _ainvoke_single_flight(
+        self, key: str, request: _LLMRequest, slot: _CacheSlot
+    ) -> str:
+        """发起异步LLM调用，并让同时到达的相同请求共享结果。
+
+        Args:
+            key: 提示词哈希
+            request: LLM请求
+            slot: 缓存回填位置
+
+        Returns:
+            str: 响应内容
+        """
+        if self.llm_client is None:
+            raise ValueError("LLM客户端未配置")
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self.llm_client.ainvoke(self._build_messages(request))
+            text = self._store_response(slot, self._extract_text(response))
+        except BaseException as e:
+            # 等待中的请求同样收到失败，各自返回备用响应
+            future.set_exception(
+                e if isinstance(e, Exception) else RuntimeError("LLM请求已取消")
+            )
+            # 标记异常已被读取，没有等待者时不产生"never retrieved"警告
+            future.exception()
+            raise
+        else:
+            future.set_result(text)
+            return text
+        finally:
+            del self._inflight[key]
+
+    async def _astream_complete(self, request: _LLMRequest) -> AsyncIterator[str]:
+        """流式调用LLM完成请求，失败或未配置LLM时产出备用响应。
+
+        缓存命中时直接以单个片段产出缓存内容；流式生成完整结束后
+        才回填缓存，中途失败的部分响应不会被缓存。
+
+        Args:
+            request: LLM请求
+
+        Yields:
+            str: 响应文本增量片段
+        """
+        if not self.llm_client:
+            yield request.fallback
+            return
+
+        emitted = False
+        try:
+            cached, slot = self._lookup_cache(request)
+            if cached is not None:
+                yield cached
+                return
+
+            chunks: List[str] = []
+            async for chunk in self.llm_client.astream(self._build_messages(request)):
+                text = self._extract_text(chunk)
+                if text:
+                    chunks.append(text)
+                    emitted = True
+                    yield text
+            if not chunks:
+                yield request.fallback
+                return
+            self._store_response(slot, "".join(chunks))
+        except Exception as e:
+            if emitted:
+                # 已经向客户端输出了部分内容，不再追加备用响应
+                logger.warning("LLM流式响应中断: %s", e)
+                return
+            logger.warning("LLM调用失败，使用备用响应: %s", e)
+            yield request.fallback
+
+    def _build_messages(self, request: _LLMRequest) -> List[BaseMessage]:
+        """构建发送给LLM的消息列表。"""
+        return [_SYS_MSG, HumanMessage(content=request.prompt)]
+
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        """计算 (系统提示词, 用户提示词) 的哈希，作为缓存和请求合并的键。"""
+        return hashlib.sha256(
+            f"{PSYCHOLOGY_MASTER_SYSTEM_PROMPT}\x00{prompt}".encode("utf-8")
+        ).hexdigest()
+
+    def _lookup_cache(self, request: _LLMRequest) -> Tuple[Optional[str], _CacheSlot]:
+        """查找请求的缓存响应。
+
+        temperature为0时输出是确定的，相同的提示词直接返回缓存结果，
+        省去一次网络往返和token消耗。配置了embedder时，还会按意图
+        查找与用户原始消息语义相近的已缓存响应。
+
+        Args:
+            request: LLM请求
+
+        Returns:
+            (命中的缓存响应或None, 未命中时用于回填缓存的位置)
+        """
+        slot = _CacheSlot()
+
+        if self._response_cache_size > 0 and getattr(
+            self.llm_client, "temperature", None
+        ) == 0:
+            slot.key = self._prompt_key(request.prompt)
+            cached = self._response_cache.get(slot.key)
+            if cached is not None:
+                self._response_cache.move_to_end(slot.key)
+                self.cache_stats["hits"] += 1
+                return cached, slot
+            self.cache_stats["misses"] += 1
+
+        semantic_cache = (
+            self._semantic_caches.get(request.intent) if request.intent else None
+        )
+        if semantic_cache is not None and request.query:
+            slot.semantic_cache = semantic_cache
+            slot.vector = semantic_cache.embed(request.query)
+            similar = semantic_cache.lookup(slot.vector)
+            if similar is not None:
+                self.cache_stats["semantic_hits"] += 1
+                return similar, slot
+
+        return None, slot
+
+    @staticmethod
+    def _extract_text(response: BaseMessage) -> str:
+        """提取LLM响应的文本内容。
+
+        content 可能是字符串，也可能是由字符串/内容块组成的列表。
+        """
+        content = response.content
+        if isinstance(content, str):
+            return content
+        # 如果是列表，尝试提取字符串
+        return next((item for item in content if isinstance(item, str)), str(content))
+
+    def _store_response(self, slot: _CacheSlot, text: str) -> str:
+        """将LLM响应文本回填缓存。"""
+        if slot.key:
+            self._response_cache[slot.key] = text
+            if len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+
+        if slot.semantic_cache is not None and slot.vector is not None:
+            slot.semantic_cache.add(slot.vector, text)
+
+        return text
+
     def _get_rag_context(self, query: str) -> str:
-        """获取RAG上下文。"""
+        """获取RAG上下文。
+
+        内容相同的检索结果只保留一份，并按配置截断单条内容和
+        拼接后的总长度，控制发送给LLM的提示词token数。
+        """
         results = self.knowledge_retriever.retrieve(query, top_k=2)
 
         if not results:
             return ""
 
+        chunk_limit = settings.max_rag_chunk_chars
         contexts = []
+        seen: Set[bytes] = set()
         for result in results:
+            digest = hashlib.blake2b(
+                result.content.encode("utf-8"), digest_size=8
+            ).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+
+            content = result.content
+            if len(content) > chunk_limit:
+                logger.debug(
+                    "Truncated RAG chunk: %d -> %d chars", len(content), chunk_limit
+                )
+                content = content[:chunk_limit]
             contexts.append(
-                f"【{result.metadata.get('description', '知识')}】\n{result.content}\n"
+                f"【{result.metadata.get('description', '知识')}】\n{content}\n"
             )
 
-        return "\n\n".join(contexts)
+        context = "\n\n".join(contexts)
+        if len(context) > settings.max_rag_context_chars:
+            logger.info(
+                "Truncated RAG context: %d -> %d chars",
+                len(context),
+                settings.max_rag_context_chars,
+            )
+            context = context[: settings.max_rag_context_chars]
+        return context
 
-    def _generate_knowledge_response(self, query: str, context: str) -> str:
-        """生成知识问答响应。
+    def _knowledge_request(self, query: str, context: str) -> _LLMRequest:
+        """构建知识问答请求。
 
         Args:
             query: 用户问题
             context: RAG检索的上下文
 
         Returns:
-            str: 响应内容
+            _LLMRequest: 知识问答LLM请求
         """
-        # 如果有LLM客户端，使用LLM生成响应
-        if self.llm_client:
-            try:
-                prompt = RAG_PROMPT_TEMPLATE.format(context=context, question=query)
-                messages = [
-                    SystemMessage(content=PSYCHOLOGY_MASTER_SYSTEM_PROMPT),
-                    HumanMessage(content=prompt),
-                ]
-                response = self.llm_client.invoke(messages)
-                # 处理可能的复杂内容类型
-                content = response.content
-                if isinstance(content, str):
-                    return content
-                elif isinstance(content, list):
-                    # 如果是列表，尝试提取字符串
-                    for item in content:
-                        if isinstance(item, str):
-                            return item
-                return str(content)
-            except Exception as e:
-                logger.warning(f"LLM调用失败，使用备用响应: {e}")
-
         # 备用响应（无LLM时）
         if context:
-            return (
+            fallback = (
                 f"我找到了一些相关的知识信息，供你参考：\n\n"
                 f"{context}\n\n"
                 f"希望这些信息对你有帮助。如果你有更多问题，欢迎继续问我。"
             )
+        else:
+            # 如果没有检索结果，使用通用响应
+            fallback = (
+                "这是一个很好的问题。关于心理健康，"
+                "我可以分享一些专业的知识。\n\n"
+                "你具体想了解哪个方面呢？比如：\n"
+                "- 压力管理技巧\n"
+                "- 情绪调节方法\n"
+                "- 焦虑/抑郁的应对方式\n"
+                "- 心理疗愈技术\n\n"
+                "请告诉我你想了解的内容，我会尽力帮助你。"
+            )
 
-        # 如果没有检索结果，使用通用响应
-        return (
-            "这是一个很好的问题。关于心理健康，"
-            "我可以分享一些专业的知识。\n\n"
-            "你具体想了解哪个方面呢？比如：\n"
-            "- 压力管理技巧\n"
-            "- 情绪调节方法\n"
-            "- 焦虑/抑郁的应对方式\n"
-            "- 心理疗愈技术\n\n"
-            "请告诉我你想了解的内容，我会尽力帮助你。"
+        return _LLMRequest(
+            prompt=RAG_PROMPT_TEMPLATE.format(context=context, question=query),
+            fallback=fallback,
+            intent=IntentType.KNOWLEDGE_QUERY,
+            query=query,
         )
 
-    def _generate_empathy_response(self, message: str) -> str:
-        """生成共情响应。
+    def _empathy_request(self, message: str) -> _LLMRequest:
+        """构建共情响应请求。
 
         Args:
             message: 用户消息
 
         Returns:
-            str: 共情响应内容
+            _LLMRequest: 共情LLM请求
         """
-        # 如果有LLM客户端，使用LLM生成响应
-        if self.llm_client:
-            try:
-                prompt = f"{EMPATHY_RESPONSE_PROMPT}\n\n用户说：{message}"
-                messages = [
-                    SystemMessage(content=PSYCHOLOGY_MASTER_SYSTEM_PROMPT),
-                    HumanMessage(content=prompt),
-                ]
-                response = self.llm_client.invoke(messages)
-                content = response.content
-                if isinstance(content, str):
-                    return content
-                elif isinstance(content, list):
-                    for item in content:
-                        if isinstance(item, str):
-                            return item
-                return str(content)
-            except Exception as e:
-                logger.warning(f"LLM调用失败，使用备用响应: {e}")
-
-        # 备用响应（无LLM时）
-        response = "谢谢你愿意告诉我这些。我在这里倾听你。\n\n"
-        response += (
-            "如果你愿意，可以多说说你的想法和感受。\n"
-            "或者，如果你需要一些帮助，我也可以提供一些"
-            "情绪调节的小技巧。"
+        return _LLMRequest(
+            prompt=f"{EMPATHY_RESPONSE_PROMPT}\n\n用户说：{message}",
+            fallback=(
+                "谢谢你愿意告诉我这些。我在这里倾听你。\n\n"
+                "如果你愿意，可以多说说你的想法和感受。\n"
+                "或者，如果你需要一些帮助，我也可以提供一些"
+                "情绪调节的小技巧。"
+            ),
+            intent=IntentType.EMOTIONAL_SUPPORT,
+            query=message,
         )
 
-        return response
-
     def _generate_help_response(self, message: str) -> str:
         """生成帮助请求响应。"""
         return (
@@ -383,12 +749,23 @@ class PsychologyMasterAgent:
             "你现在最想获得什么样的帮助呢？"
         )
 
-    def _generate_intervention_response(self, message: str) -> str:
-        """生成干预响应。"""
-        message_lower = message.lower()
+    def _generate_intervention_response(
+        self, message: str, found: Optional[Set[str]] = None
+    ) -> str:
+        """生成干预响应。
+
+        Args:
+            message: 用户消息
+            found: 已扫描出的关键词（未提供时重新扫描消息）
+
+        Returns:
+            干预练习引导内容
+        """
+        if found is None:
+            found = self._keyword_matcher.find(message.lower())
 
         # 正念/冥想
-        if "冥想" in message_lower or "正念" in message_lower:
+        if not found.isdisjoint(_MINDFULNESS_KEYWORDS):
             return (
                 "当然可以！让我带你进行一次简单的正念练习。\n\n"
                 "【5分钟正念呼吸练习】\n\n"
@@ -402,7 +779,7 @@ class PsychologyMasterAgent:
             )
 
         # 深呼吸
-        if "呼吸" in message_lower or "放松" in message_lower:
+        if not found.isdisjoint(_BREATHING_KEYWORDS):
             return (
                 "好的，让我们做一个放松练习。\n\n"
                 "【4-7-8 呼吸法】\n\n"
@@ -415,7 +792,7 @@ class PsychologyMasterAgent:
             )
 
         # CBT练习
-        if "认知" in message_lower or "cbt" in message_lower or "思维" in message_lower:
+        if not found.isdisjoint(_COGNITIVE_KEYWORDS):
             return (
                 "好的，让我们做一个简单的CBT练习。\n\n"
                 "【思维记录表】\n\n"
@@ -441,46 +818,26 @@ class PsychologyMasterAgent:
             "请告诉我你的选择。"
         )
 
-    def _generate_general_response(self, message: str) -> str:
-        """生成一般对话响应。
+    def _general_request(self, message: str) -> _LLMRequest:
+        """构建一般对话请求。
 
         Args:
             message: 用户消息
 
         Returns:
-            str: 一般对话响应
+            _LLMRequest: 一般对话LLM请求
         """
-        logger.info(f"LLM client in _generate_general_response: {self.llm_client}")
-        # 如果有LLM客户端，使用LLM生成响应
-        if self.llm_client:
-            logger.info("Using LLM for response generation")
-            try:
-                prompt = f"用户说：{message}\n\n请给出温暖、专业的回应。"
-                messages = [
-                    SystemMessage(content=PSYCHOLOGY_MASTER_SYSTEM_PROMPT),
-                    HumanMessage(content=prompt),
-                ]
-                response = self.llm_client.invoke(messages)
-                content = response.content
-                if isinstance(content, str):
-                    return content
-                elif isinstance(content, list):
-                    for item in content:
-                        if isinstance(item, str):
-                            return item
-                return str(content)
-            except Exception as e:
-                logger.warning(f"LLM调用失败，使用备用响应: {e}")
-
-        # 备用响应（无LLM时）
-        return (
-            "我在这里倾听你。\n\n"
-            "你可以告诉我：\n"
-            "- 你的感受和想法\n"
-            "- 困惑你的问题\n"
-            "- 想要了解的心理知识\n"
-            "- 需要帮助的方面\n\n"
-            "我会尽力帮助你。"
+        return _LLMRequest(
+            prompt=f"用户说：{message}\n\n请给出温暖、专业的回应。",
+            fallback=(
+                "我在这里倾听你。\n\n"
+                "你可以告诉我：\n"
+                "- 你的感受和想法\n"
+                "- 困惑你的问题\n"
+                "- 想要了解的心理知识\n"
+                "- 需要帮助的方面\n\n"
+                "我会尽力帮助你。"
+            ),
         )
 
 
@@ -500,13 +857,10 @@ def get_psychology_master_agent(
         PsychologyMasterAgent: Agent实例
     """
     global _agent
-    print(
-        f"DEBUG get_psychology_master_agent: _agent={_agent}, llm_client={llm_client}"
-    )
     if _agent is None:
-        print("DEBUG: Creating new agent")
+        logger.debug("Creating new agent: llm_client=%s", llm_client)
         _agent = PsychologyMasterAgent(llm_client=llm_client)
     elif llm_client is not None:
-        print("DEBUG: Updating existing agent's LLM client")
+        logger.debug("Updating existing agent's LLM client")
         _agent.llm_client = llm_client
     return _agent
@@ -0,0 +1,99 @@
+"""Semantic response cache keyed by query embedding similarity."""
+
+import logging
+from collections.abc import Callable, Sequence
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 文本向量化函数：输入文本，返回定长向量
+Embedder = Callable[[str], Sequence[float]]
+
+
+class SemanticCache:
+    """语义缓存。
+
+    缓存 (查询向量, 响应) 对，新查询与已缓存查询的余弦相似度
+    达到阈值时直接返回缓存的响应，用一次轻量的向量化调用
+    代替一次完整的LLM生成。
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        threshold: float = 0.92,
+        max_size: int = 512,
+    ):
+        """初始化语义缓存。
+
+        Args:
+            embedder: 文本向量化函数
+            threshold: 命中所需的最小余弦相似度
+            max_size: 最大缓存条目数，超出时淘汰最久未使用的条目
+        """
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        # 已归一化的向量矩阵，每行对应 _responses 中同位置的响应
+        self._vectors: Optional[np.ndarray] = None
+        self._responses: list[str] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        """向量化并归一化文本。"""
+        vector = np.asarray(self.embedder(text), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: np.ndarray) -> Optional[str]:
+        """查找与给定向量足够相似的缓存响应。
+
+        Args:
+            vector: 已归一化的查询向量（由 embed 生成）
+
+        Returns:
+            命中时返回缓存的响应，否则返回None
+        """
+        if self._vectors is None:
+            return None
+
+        similarities = self._vectors @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        # 命中后移到末尾，保持LRU顺序
+        response = self._responses[best]
+        self._move_to_end(best)
+        return response
+
+    def add(self, vector: np.ndarray, response: str) -> None:
+        """添加缓存条目。
+
+        Args:
+            vector: 已归一化的查询向量（由 embed 生成）
+            response: 对应的响应内容
+        """
+        row = vector.reshape(1, -1)
+        if self._vectors is None:
+            self._vectors = row
+        else:
+            self._vectors = np.vstack((self._vectors, row))
+        self._responses.append(response)
+
+        if len(self._responses) > self.max_size:
+            self._vectors = self._vectors[1:]
+            del self._responses[0]
+
+    def _move_to_end(self, index: int) -> None:
+        """将指定条目移到末尾（最近使用）。"""
+        if self._vectors is None or index == len(self._responses) - 1:
+            return
+        order = np.r_[0:index, index + 1 : len(self._responses), index]
+        self._vectors = self._vectors[order]
+        self._responses.append(self._responses.pop(index))
+
+    def __len__(self) -> int:
+        """返回缓存条目数。"""
+        return len(self._responses)
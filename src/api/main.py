@@ -1,24 +1,35 @@
 """FastAPI application for Minghe Companion."""
 
-import uuid
+import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import AsyncIterator
 
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.agents.psychology_master import (
+    AgentResponse,
     PsychologyMasterAgent,
     get_psychology_master_agent,
 )
 from src.llm.client import get_llm_client
+from src.memory.system import get_memory_system, new_session_id
+from src.tools.assessment import get_assessment_tool
 from src.core.config import settings
 
+logging.basicConfig(level=settings.log_level.upper())
+logger = logging.getLogger(__name__)
+
 
 class ChatRequest(BaseModel):
     """聊天请求。"""
 
+    model_config = ConfigDict(frozen=True)
+
     user_id: str = Field(..., description="用户ID")
     message: str = Field(..., min_length=1, description="用户消息")
     session_id: str | None = Field(default=None, description="会话ID")
@@ -27,6 +38,8 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     """聊天响应。"""
 
+    model_config = ConfigDict(frozen=True)
+
     response: str
     intent: str
     risk_level: str
@@ -38,6 +51,8 @@ class ChatResponse(BaseModel):
 class HealthResponse(BaseModel):
     """健康检查响应。"""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str
     timestamp: datetime
     version: str
@@ -47,10 +62,14 @@ class HealthResponse(BaseModel):
 async def lifespan(app: FastAPI):
     """应用生命周期管理。"""
     # 启动时
-    print("Starting Minghe Companion API...")
+    logger.info("Starting Minghe Companion API...")
+    # 预先创建LLM客户端和Agent（含知识库、记忆系统等单例），
+    # 避免首个用户请求承担初始化开销
+    app.state.llm_client = get_llm_client()
+    app.state.agent = get_psychology_master_agent(llm_client=app.state.llm_client)
     yield
     # 关闭时
-    print("Shutting down Minghe Companion API...")
+    logger.info("Shutting down Minghe Companion API...")
 
 
 # 创建FastAPI应用
@@ -71,11 +90,15 @@ app.add_middleware(
 )
 
 
+# 健康检查的固定字段，每次探测只需刷新时间戳
+_HEALTH_BASE = {"status": "healthy", "version": "0.1.0"}
+
+
 # 健康检查端点
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """健康检查。"""
-    return HealthResponse(status="healthy", timestamp=datetime.now(), version="0.1.0")
+    return {**_HEALTH_BASE, "timestamp": datetime.now()}
 
 
 # 聊天端点
@@ -90,37 +113,92 @@ async def chat(request: ChatRequest):
         ChatResponse: Agent响应
     """
     # 获取或生成session_id
-    session_id = request.session_id or str(uuid.uuid4())
+    session_id = request.session_id or new_session_id()
 
     try:
-        # 获取LLM客户端
-        llm_client = get_llm_client()
-        print(f"DEBUG: llm_client = {llm_client}, api_key = {llm_client.api_key}")
+        # Agent实例在启动时已创建
+        agent: PsychologyMasterAgent = app.state.agent
 
-        # 获取Agent实例
-        agent = get_psychology_master_agent(llm_client=llm_client)
-        print(f"DEBUG: agent.llm_client = {agent.llm_client}")
-
-        # 处理消息
-        response = agent.chat(
+        # 处理消息（异步调用LLM，不阻塞事件循环）
+        response = await agent.achat(
             user_id=request.user_id,
             message=request.message,
             session_id=session_id,
         )
 
-        return ChatResponse(
-            response=response.content,
-            intent=response.intent.value,
-            risk_level=response.risk_level.value,
-            session_id=session_id,
-            tools_used=response.tools_used,
-            metadata=response.metadata,
-        )
+        # 直接返回字典，由response_model统一校验和序列化，避免先构建一次模型
+        return {
+            "response": response.content,
+            "intent": response.intent.value,
+            "risk_level": response.risk_level.value,
+            "session_id": session_id,
+            "tools_used": response.tools_used,
+            "metadata": response.metadata,
+        }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"处理消息时发生错误: {str(e)}")
 
 
+def _sse_event(payload: dict) -> str:
+    """编码一条SSE事件。"""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+
+# 流式聊天端点
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """与心理资讯大师流式对话。
+
+    以Server-Sent Events逐段推送LLM生成的文本，首个片段生成后
+    即可开始展示，无需等待完整响应。
+
+    事件格式：
+        data: {"delta": "..."}         文本增量片段
+        data: {"done": true, ...}      结束事件，附带意图、风险等级等信息
+        data: {"error": "..."}         处理失败
+
+    Args:
+        request: 聊天请求
+
+    Returns:
+        StreamingResponse: text/event-stream 响应
+    """
+    session_id = request.session_id or new_session_id()
+    agent: PsychologyMasterAgent = app.state.agent
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for item in agent.astream_chat(
+                user_id=request.user_id,
+                message=request.message,
+                session_id=session_id,
+            ):
+                if isinstance(item, AgentResponse):
+                    yield _sse_event(
+                        {
+                            "done": True,
+                            "intent": item.intent.value,
+                            "risk_level": item.risk_level.value,
+                            "session_id": session_id,
+                            "tools_used": item.tools_used,
+                            "metadata": item.metadata,
+                        }
+                    )
+                else:
+                    yield _sse_event({"delta": item})
+        except Exception as e:
+            # 响应头已发出，错误只能以事件形式通知客户端
+            logger.exception("Streaming chat failed")
+            yield _sse_event({"error": f"处理消息时发生错误: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # 评估端点
 @app.post("/assessment")
 async def assessment(user_id: str, assessment_type: str, answers: dict[str, int]):
@@ -134,8 +212,6 @@ async def assessment(user_id: str, assessment_type: str, answers: dict[str, int]
     Returns:
         评估结果
     """
-    from src.tools.assessment import get_assessment_tool
-
     try:
         assessment_tool = get_assessment_tool()
         result = assessment_tool.calculate_score(assessment_type, answers)
@@ -149,28 +225,37 @@ async def assessment(user_id: str, assessment_type: str, answers: dict[str, int]
         raise HTTPException(status_code=500, detail=f"评估计算错误: {str(e)}")
 
 
+# 评估模板是静态的，按类型缓存序列化后的响应体（只缓存存在的类型）
+_template_bodies: dict[str, bytes] = {}
+
+
 # 评估模板端点
 @app.get("/assessment/template/{assessment_type}")
 async def get_assessment_template(assessment_type: str):
     """获取评估问卷模板。
 
+    首次请求某类型时序列化模板，之后直接返回缓存的JSON字节，
+    跳过对嵌套模板的逐层编码。
+
     Args:
         assessment_type: 评估类型
 
     Returns:
         评估模板
     """
-    from src.tools.assessment import get_assessment_tool
+    body = _template_bodies.get(assessment_type)
+    if body is None:
+        assessment_tool = get_assessment_tool()
+        template = assessment_tool.get_assessment_template(assessment_type)
 
-    assessment_tool = get_assessment_tool()
-    template = assessment_tool.get_assessment_template(assessment_type)
+        if not template:
+            raise HTTPException(
+                status_code=404, detail=f"未找到评估类型: {assessment_type}"
+            )
 
-    if not template:
-        raise HTTPException(
-            status_code=404, detail=f"未找到评估类型: {assessment_type}"
-        )
+        body = _template_bodies[assessment_type] = orjson.dumps(template)
 
-    return template
+    return Response(content=body, media_type="application/json")
 
 
 # 用户画像端点
@@ -184,8 +269,6 @@ async def get_user_profile(user_id: str):
     Returns:
         用户画像
     """
-    from src.memory.system import get_memory_system
-
     memory_system = get_memory_system()
     profile = memory_system.get_user_profile(user_id)
 
@@ -212,8 +295,6 @@ async def update_user_profile(user_id: str, updates: dict[str, str]):
     Returns:
         更新后的用户画像
     """
-    from src.memory.system import get_memory_system
-
     memory_system = get_memory_system()
     profile = memory_system.update_user_profile(user_id, **updates)
 
@@ -7,6 +7,7 @@ from src.core.constants import (
     IntentType,
     InterventionType,
     CRISIS_KEYWORDS,
+    INTENT_KEYWORDS,
     PROFESSIONAL_HOTLINES,
     AGE_GROUP_DESCRIPTIONS,
     DEFAULT_AGENT_CONFIG,
@@ -31,6 +32,7 @@ __all__ = [
     "IntentType",
     "InterventionType",
     "CRISIS_KEYWORDS",
+    "INTENT_KEYWORDS",
     "PROFESSIONAL_HOTLINES",
     "AGE_GROUP_DESCRIPTIONS",
     "DEFAULT_AGENT_CONFIG",
@@ -1,6 +1,6 @@
 """Configuration management for Minghe Companion."""
 
-from functools import lru_cache
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -46,6 +46,12 @@ class Settings(BaseSettings):
     crisis_keywords_path: str = Field(
         default="knowledge_base/crisis_keywords.json", description="危机关键词文件"
     )
+    max_rag_chunk_chars: int = Field(
+        default=1200, description="单条RAG检索内容的最大字符数"
+    )
+    max_rag_context_chars: int = Field(
+        default=4000, description="拼接后RAG上下文的最大字符数"
+    )
 
     # 安全
     allowed_origins: str = Field(
@@ -55,9 +61,9 @@ class Settings(BaseSettings):
     session_timeout: int = Field(default=3600, description="会话超时秒数")
     rate_limit_per_minute: int = Field(default=60, description="每分钟请求限制")
 
-    @property
+    @cached_property
     def allowed_origins_list(self) -> list[str]:
-        """获取允许的来源列表。"""
+        """获取允许的来源列表（首次访问时解析并缓存）。"""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
     @property
@@ -66,11 +72,10 @@ class Settings(BaseSettings):
         return not self.api_debug
 
 
-@lru_cache
-def get_settings() -> Settings:
-    """获取配置单例。"""
-    return Settings()
+# 全局配置实例（导入时创建）
+settings = Settings()
 
 
-# 全局配置实例
-settings = get_settings()
+def get_settings() -> Settings:
+    """获取配置单例。"""
+    return settings
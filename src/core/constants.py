@@ -78,6 +78,52 @@ CRISIS_KEYWORDS = {
     ],
 }
 
+# 意图识别关键词（按优先级排列，先命中的意图优先；使用不可变元组）
+INTENT_KEYWORDS = {
+    IntentType.KNOWLEDGE_QUERY: (
+        "是什么",
+        "为什么",
+        "如何",
+        "怎么",
+        "什么是",
+        "解释",
+    ),
+    IntentType.PRACTICE_REQUEST: (
+        "练习",
+        "冥想",
+        "深呼吸",
+        "放松",
+        "正念",
+        "帮我",
+        "教我",
+        "我想做",
+        "可以教",
+    ),
+    IntentType.HELP_SEEKING: (
+        "怎么办",
+        "不知道怎么",
+        "求助",
+        "帮我",
+        "很烦",
+        "很痛苦",
+        "难过",
+        "抑郁",
+        "焦虑",
+    ),
+    # 情感倾诉（较长且包含情感词）
+    IntentType.EMOTIONAL_SUPPORT: (
+        "心情",
+        "感受",
+        "情绪",
+        "很难过",
+        "很伤心",
+        "压力",
+        "烦恼",
+        "倾诉",
+        "说说",
+    ),
+}
+
 # 专业心理援助热线
 PROFESSIONAL_HOTLINES = {
     "全国心理援助热线": "400-161-9995",
@@ -86,27 +132,28 @@ PROFESSIONAL_HOTLINES = {
     "希望24热线": "400-161-9995",
 }
 
-# 年龄段描述
+# 年龄段描述（以原始字符串为键，用户资料中的 age_group 字符串可直接查找；
+# AgeGroup 是 str 枚举，用成员查找同样命中）
 AGE_GROUP_DESCRIPTIONS = {
-    AgeGroup.ADOLESCENT: {
+    AgeGroup.ADOLESCENT.value: {
         "name": "青少年",
         "age_range": "13-18岁",
         "characteristics": "自我认同发展、学业压力、同伴关系",
         "communication_style": "平等尊重、避免说教、轻松自然",
     },
-    AgeGroup.YOUNG_ADULT: {
+    AgeGroup.YOUNG_ADULT.value: {
         "name": "青年",
         "age_range": "18-35岁",
         "characteristics": "职业发展、人际关系、生活压力",
         "communication_style": "理解压力、实用建议、尊重独立",
     },
-    AgeGroup.MIDDLE_ADULT: {
+    AgeGroup.MIDDLE_ADULT.value: {
         "name": "中年",
         "age_range": "35-60岁",
         "characteristics": "家庭责任、职业瓶颈、中年危机",
         "communication_style": "尊重经验、平衡视角、务实建议",
     },
-    AgeGroup.SENIOR: {
+    AgeGroup.SENIOR.value: {
         "name": "老年",
         "age_range": "60岁以上",
         "characteristics": "退休适应、健康关注、孤独感",
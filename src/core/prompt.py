@@ -94,41 +94,49 @@ RAG_PROMPT_TEMPLATE = """基于以下上下文信息回答用户问题。如果
 请提供专业、温暖、有帮助的回答。"""
 
 
-def get_age_specific_prompt(age_group: str) -> str:
-    """获取年龄段特定的提示词。"""
-
-    age_prompts = {
-        "adolescent": """
+# 年龄段特定提示词
+_AGE_PROMPTS: Dict[str, str] = {
+    "adolescent": """
 作为青少年心理顾问，请注意：
 - 使用平等尊重的语气，避免说教
 - 理解青少年面临的学业、同伴、家庭压力
 - 肯定青少年的自我探索
 - 提供适合青少年的实用建议
 """,
-        "young_adult": """
+    "young_adult": """
 作为青年心理顾问，请注意：
 - 理解青年面临职业发展、人际关系、生活压力
 - 提供实用、可操作的建议
 - 尊重青年的独立性和自主性
 - 关注现代生活压力源
 """,
-        "middle_adult": """
+    "middle_adult": """
 作为中年心理顾问，请注意：
 - 尊重中年人的生活经验
 - 理解家庭、职业双重压力
 - 提供平衡视角的建议
 - 关注中年危机相关话题
 """,
-        "senior": """
+    "senior": """
 作为老年心理顾问，请注意：
 - 使用耐心、温和的语气
 - 尊重老人的人生经验
 - 关注退休适应、健康、孤独感话题
 - 给予价值认可
 """,
-    }
+}
+
+
+def get_age_specific_prompt(age_group: str) -> str:
+    """获取年龄段特定的提示词。"""
+    return _AGE_PROMPTS.get(age_group, "")
+
 
-    return age_prompts.get(age_group, "")
+# 系统提示词 + 年龄段提示词的固定前缀，按年龄段预先拼接
+_BASE_BY_AGE: Dict[str, str] = {
+    age_group: PSYCHOLOGY_MASTER_SYSTEM_PROMPT + age_prompt
+    for age_group, age_prompt in _AGE_PROMPTS.items()
+}
 
 
 def build_agent_prompt(
@@ -136,13 +144,16 @@ def build_agent_prompt(
     memory_context: str = "",
     tools_used: list[str] | None = None,
 ) -> str:
-    """构建完整的Agent提示词。"""
+    """构建完整的Agent提示词。
 
-    base_prompt = PSYCHOLOGY_MASTER_SYSTEM_PROMPT
+    固定前缀（系统提示词 + 年龄段提示词）直接取预先拼接的结果，
+    每次只追加动态的记忆和工具部分；前缀保持一致也便于LLM服务端
+    复用提示词缓存。
+    """
 
-    # 添加年龄特定提示
+    # 年龄特定前缀
     age_group = user_info.get("age_group", "young_adult")
-    age_prompt = get_age_specific_prompt(age_group)
+    prefix = _BASE_BY_AGE.get(age_group, PSYCHOLOGY_MASTER_SYSTEM_PROMPT)
 
     # 添加记忆上下文
     memory_prompt = f"\n\n## 用户历史信息\n{memory_context}\n" if memory_context else ""
@@ -152,4 +163,4 @@ def build_agent_prompt(
     if tools_used:
         tools_prompt = f"\n\n## 已使用的工具\n{', '.join(tools_used)}\n"
 
-    return f"{base_prompt}{age_prompt}{memory_prompt}{tools_prompt}"
+    return "".join((prefix, memory_prompt, tools_prompt))
@@ -2,16 +2,42 @@
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
-
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+import orjson
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
 from langchain.chat_models.base import BaseChatModel
 from pydantic import Field
 
+from src.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# 进程内共享的HTTP连接池，保持keep-alive，避免每次调用重新建立TCP+TLS连接
+_HTTP_TIMEOUT = 60
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32)
+_http_client = httpx.Client(timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+_async_http_client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+
+# LangChain消息类型 -> DeepSeek API角色，未列出的类型按用户消息处理
+_ROLE_MAP: Dict[type, str] = {
+    SystemMessage: "system",
+    HumanMessage: "user",
+    AIMessage: "assistant",
+}
+
 
 class ChatDeepSeek(BaseChatModel):
     """DeepSeek Chat model.
@@ -28,15 +54,10 @@ class ChatDeepSeek(BaseChatModel):
     def __init__(self, **data: Any):
         """初始化LLM客户端。"""
         super().__init__(**data)
-        if not self.api_key:
-            # 先尝试环境变量
-            self.api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not self.api_key:
-            # 再尝试从配置文件读取
-            from src.core.config import get_settings
-
-            settings = get_settings()
-            self.api_key = settings.deepseek_api_key
+        # 未显式传入时，依次尝试环境变量和配置文件
+        self.api_key = (
+            self.api_key or os.getenv("DEEPSEEK_API_KEY") or settings.deepseek_api_key
+        )
 
     @property
     def _llm_type(self) -> str:
@@ -51,69 +72,178 @@ class ChatDeepSeek(BaseChatModel):
         **kwargs: Any,
     ) -> ChatResult:
         """生成聊天响应。"""
-        import requests
+        url, headers, payload = self._prepare_request(messages, stop)
+        try:
+            response = _http_client.post(url, headers=headers, content=payload)
+            return self._parse_response(response)
+        except Exception as e:
+            logger.error("DeepSeek API调用失败: %s", e)
+            raise
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """异步生成聊天响应，直接使用异步连接池，不占用线程池。"""
+        url, headers, payload = self._prepare_request(messages, stop)
+        try:
+            response = await _async_http_client.post(
+                url, headers=headers, content=payload
+            )
+            return self._parse_response(response)
+        except Exception as e:
+            logger.error("DeepSeek API调用失败: %s", e)
+            raise
 
-        logger.info(
-            f"DeepSeek _generate called with {len(messages)} messages, api_key set: {bool(self.api_key)}"
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """流式生成聊天响应，按SSE帧逐段产出增量文本。"""
+        url, headers, payload = self._prepare_request(messages, stop, stream=True)
+        try:
+            with _http_client.stream(
+                "POST", url, headers=headers, content=payload
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                self._check_status(response)
+                for line in response.iter_lines():
+                    chunk = self._parse_stream_line(line)
+                    if chunk is None:
+                        continue
+                    if run_manager:
+                        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+        except Exception as e:
+            logger.error("DeepSeek API流式调用失败: %s", e)
+            raise
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """异步流式生成聊天响应。"""
+        url, headers, payload = self._prepare_request(messages, stop, stream=True)
+        try:
+            async with _async_http_client.stream(
+                "POST", url, headers=headers, content=payload
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                self._check_status(response)
+                async for line in response.aiter_lines():
+                    chunk = self._parse_stream_line(line)
+                    if chunk is None:
+                        continue
+                    if run_manager:
+                        await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+        except Exception as e:
+            logger.error("DeepSeek API流式调用失败: %s", e)
+            raise
+
+    def _prepare_request(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        stream: bool = False,
+    ) -> tuple[str, Dict[str, str], bytes]:
+        """构建API请求的URL、请求头和请求体（orjson编码的JSON字节串）。"""
+        logger.debug(
+            "DeepSeek request with %d messages, api_key set: %s",
+            len(messages),
+            bool(self.api_key),
         )
 
         if not self.api_key:
             logger.error("DEEPSEEK_API_KEY is not set!")
             raise ValueError("DEEPSEEK_API_KEY未设置，请在.env文件中配置")
 
-        try:
-            # 转换消息格式
-            deepseek_messages = self._convert_messages(messages)
-
-            # 调用API
-            response = requests.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
+        return (
+            f"{self.base_url}/v1/chat/completions",
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            orjson.dumps(
+                {
                     "model": self.model_name,
-                    "messages": deepseek_messages,
+                    "messages": self._convert_messages(messages),
                     "temperature": self.temperature,
                     "max_tokens": self.max_tokens,
                     "stop": stop,
-                },
-                timeout=60,
+                    "stream": stream,
+                }
+            ),
+        )
+
+    @staticmethod
+    def _check_status(response: httpx.Response) -> None:
+        """检查API响应状态码，非200时记录并抛出异常。"""
+        if response.status_code != 200:
+            logger.error(
+                "DeepSeek API错误: %s %s", response.status_code, response.text
             )
+            raise Exception(f"API错误: {response.status_code}")
 
-            if response.status_code != 200:
-                logger.error(
-                    f"DeepSeek API错误: {response.status_code} {response.text}"
-                )
-                raise Exception(f"API错误: {response.status_code}")
+    def _parse_response(self, response: httpx.Response) -> ChatResult:
+        """解析API响应。"""
+        self._check_status(response)
 
-            result = response.json()
+        result = orjson.loads(response.content)
 
-            # 解析响应
-            content = result["choices"][0]["message"]["content"]
+        # 解析响应
+        content = result["choices"][0]["message"]["content"]
 
-            # 构建ChatResult
-            message = HumanMessage(content=content)
-            generation = ChatGeneration(message=message)
+        # 构建ChatResult：回复是助手消息；内容来自我们自己解析的JSON，
+        # 用 model_construct 跳过逐字段校验。ChatGeneration 仍正常构造，
+        # 其校验器负责从消息中填充 text 字段。
+        message = AIMessage.model_construct(content=content)
+        generation = ChatGeneration(message=message)
 
-            return ChatResult(generations=[generation])
+        return ChatResult(generations=[generation])
 
-        except Exception as e:
-            logger.error(f"DeepSeek API调用失败: {e}")
-            raise
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[ChatGenerationChunk]:
+        """解析一行SSE数据，返回增量文本块；非内容行返回None。
+
+        流式响应的每一帧形如 ``data: {...}``，以 ``data: [DONE]`` 结束。
+        """
+        if not line.startswith("data:"):
+            return None
+        data = line[len("data:") :].strip()
+        if not data or data == "[DONE]":
+            return None
+
+        choices = orjson.loads(data).get("choices")
+        if not choices:
+            return None
+        delta = (choices[0].get("delta") or {}).get("content")
+        if not delta:
+            return None
+        return ChatGenerationChunk(message=AIMessageChunk(content=delta))
 
     def _convert_messages(self, messages: List[BaseMessage]) -> List[Dict[str, str]]:
         """转换消息格式为DeepSeek API所需格式。"""
-        deepseek_messages = []
-        for msg in messages:
-            if isinstance(msg, SystemMessage):
-                deepseek_messages.append({"role": "system", "content": msg.content})
-            elif isinstance(msg, HumanMessage):
-                deepseek_messages.append({"role": "user", "content": msg.content})
-            else:
-                deepseek_messages.append({"role": "user", "content": str(msg.content)})
-        return deepseek_messages
+        return [
+            {
+                "role": _ROLE_MAP.get(type(msg), "user"),
+                "content": msg.content
+                if isinstance(msg.content, str)
+                else str(msg.content),
+            }
+            for msg in messages
+        ]
 
     def _llm_used_kwargs(self) -> Dict[str, Any]:
         """返回LLM使用的额外参数。"""
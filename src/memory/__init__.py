@@ -4,16 +4,22 @@ from src.memory.system import (
     MemorySystem,
     ShortTermMemory,
     LongTermMemory,
+    Interaction,
     Message,
     UserProfile,
+    format_timestamp,
     get_memory_system,
+    new_session_id,
 )
 
 __all__ = [
     "MemorySystem",
     "ShortTermMemory",
     "LongTermMemory",
+    "Interaction",
     "Message",
     "UserProfile",
+    "format_timestamp",
     "get_memory_system",
+    "new_session_id",
 ]
@@ -1,24 +1,106 @@
 """Memory system for conversation context."""
 
 import logging
+import secrets
+import sys
+import time
+from itertools import chain, compress, islice, repeat
+from operator import contains
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def new_session_id() -> str:
+    """生成新的会话ID。
+
+    会话ID会返回给客户端，必须不可预测，因此使用 secrets 生成
+    128位随机十六进制串，省去构造UUID对象的开销。
+    """
+    return secrets.token_hex(16)
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """将交互记录的纳秒时间戳格式化为本地时间的ISO字符串。
+
+    Args:
+        timestamp_ns: time.time_ns() 形式的时间戳
+
+    Returns:
+        ISO 8601 格式的时间字符串
+    """
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+# 角色取值只有三种；Message 会驻留角色字符串，热路径上可直接用 is 比较
+_ROLE_USER = sys.intern("user")
+_ROLE_ASSISTANT = sys.intern("assistant")
+_ROLE_SYSTEM = sys.intern("system")
+
+# 渲染对话上下文时使用的角色标签
+_ROLE_LABELS = {_ROLE_USER: "用户", _ROLE_ASSISTANT: "助手", _ROLE_SYSTEM: "系统"}
+
+
+@dataclass(slots=True)
 class Message:
     """对话消息。"""
 
     role: str  # user / assistant / system
     content: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    # 创建时间，time.time_ns() 形式；大多数消息从不读取时间，按需再构造datetime
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    role_label: str = field(init=False, repr=False)  # 渲染用的中文角色名
+
+    def __post_init__(self) -> None:
+        """驻留角色字符串，并根据角色预先确定标签。"""
+        # 角色可能来自外部输入（如API请求），驻留后所有消息共享同一个字符串对象
+        self.role = sys.intern(self.role)
+        self.role_label = _ROLE_LABELS.get(self.role, "助手")
+
+    @property
+    def timestamp(self) -> datetime:
+        """消息创建时间（本地时间）。"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
+
+@dataclass(slots=True)
+class Interaction:
+    """长期记忆中的一条交互记录。
+
+    支持 ``record["message"]`` 形式的按字段名访问，兼容原先的字典记录。
+    """
+
+    # 纳秒整数时间戳，写入时不做格式化；需要展示时用 format_timestamp
+    timestamp: int
+    message: str
+    response: str
+    intent: Optional[str] = None
+    emotion: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __getitem__(self, key: str) -> Any:
+        """按字段名取值。"""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典。"""
+        return {
+            "timestamp": self.timestamp,
+            "message": self.message,
+            "response": self.response,
+            "intent": self.intent,
+            "emotion": self.emotion,
+            "metadata": self.metadata,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class UserProfile:
     """用户画像。"""
 
@@ -51,7 +133,22 @@ class ShortTermMemory:
         """
         self.max_messages = max_messages
         self.max_tokens = max_tokens
-        self._sessions: Dict[str, List[Message]] = {}
+        # 会话ID -> (系统消息, 其他消息)；其他消息使用定长deque，
+        # 超出 max_messages 时自动淘汰最旧的一条
+        self._sessions: Dict[str, Tuple[List[Message], Deque[Message]]] = {}
+        # 与 _sessions 一一对应的已渲染行（"角色: 内容"），随消息同步追加与淘汰
+        self._context_lines: Dict[str, Tuple[List[str], Deque[str]]] = {}
+        # 已渲染的对话上下文: 会话ID -> {last_n: 文本}，会话变更时整体失效
+        self._context_cache: Dict[str, Dict[int, str]] = {}
+
+    def _get_session(self, session_id: str) -> Tuple[List[Message], Deque[Message]]:
+        """获取会话的消息存储，不存在时创建。"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ([], deque(maxlen=self.max_messages))
+            self._sessions[session_id] = session
+            self._context_lines[session_id] = ([], deque(maxlen=self.max_messages))
+        return session
 
     def add_message(
         self,
@@ -68,29 +165,29 @@ class ShortTermMemory:
             content: 消息内容
             metadata: 附加元数据
         """
-        if session_id not in self._sessions:
-            self._sessions[session_id] = []
-
         message = Message(role=role, content=content, metadata=metadata or {})
+        self.add_messages(session_id, [message])
 
-        self._sessions[session_id].append(message)
-
-        # 修剪过长的会话
-        self._trim_session(session_id)
+    def add_messages(self, session_id: str, messages: List[Message]) -> None:
+        """批量添加消息到会话。
 
-    def _trim_session(self, session_id: str) -> None:
-        """修剪会话以保持大小合理。"""
-        session = self._sessions[session_id]
+        系统消息始终保留；其他消息只保留最近的 max_messages 条。
 
-        # 限制消息数量
-        if len(session) > self.max_messages:
-            # 保留最近的消息和系统提示
-            system_messages = [m for m in session if m.role == "system"]
-            other_messages = [m for m in session if m.role != "system"]
-
-            self._sessions[session_id] = (
-                system_messages + other_messages[-self.max_messages :]
-            )
+        Args:
+            session_id: 会话ID
+            messages: 待添加的消息列表
+        """
+        system_messages, other_messages = self._get_session(session_id)
+        system_lines, other_lines = self._context_lines[session_id]
+        self._context_cache.pop(session_id, None)
+        for message in messages:
+            line = f"{message.role_label}: {message.content}"
+            if message.role is _ROLE_SYSTEM:
+                system_messages.append(message)
+                system_lines.append(line)
+            else:
+                other_messages.append(message)
+                other_lines.append(line)
 
     def get_messages(
         self, session_id: str, include_system: bool = True
@@ -102,18 +199,48 @@ class ShortTermMemory:
             include_system: 是否包含系统消息
 
         Returns:
-            消息列表
+            消息列表（系统消息在前）
         """
-        messages = self._sessions.get(session_id, [])
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
 
+        system_messages, other_messages = session
         if not include_system:
-            messages = [m for m in messages if m.role != "system"]
+            return list(other_messages)
+
+        # 一次分配拼接，不为deque单独生成中间列表
+        return [*system_messages, *other_messages]
+
+    def iter_messages(
+        self, session_id: str, include_system: bool = True
+    ) -> Iterator[Message]:
+        """按顺序遍历会话消息，不复制消息列表。
+
+        适合只读一遍的调用方；遍历期间不要向同一会话添加消息。
+
+        Args:
+            session_id: 会话ID
+            include_system: 是否包含系统消息
 
-        return messages
+        Returns:
+            消息迭代器（系统消息在前）
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return iter(())
+
+        system_messages, other_messages = session
+        if not include_system:
+            return iter(other_messages)
+        return chain(system_messages, other_messages)
 
     def get_conversation_context(self, session_id: str, last_n: int = 10) -> str:
         """获取对话上下文摘要。
 
+        每条消息在加入会话时已渲染成一行，这里只做拼接；结果按
+        (会话, last_n) 缓存，会话没有新消息时直接复用。
+
         Args:
             session_id: 会话ID
             last_n: 获取最近n条消息
@@ -121,24 +248,35 @@ class ShortTermMemory:
         Returns:
             格式化的对话上下文
         """
-        messages = self.get_messages(session_id, include_system=True)
+        cached = self._context_cache.get(session_id, {}).get(last_n)
+        if cached is not None:
+            return cached
 
-        if not messages:
+        session_lines = self._context_lines.get(session_id)
+        if session_lines is None:
             return ""
 
-        recent_messages = messages[-last_n:]
+        system_lines, other_lines = session_lines
+        if 0 < last_n <= len(other_lines):
+            # 最近n条都在非系统消息中，从deque尾部直接取，不复制整个会话
+            lines: List[str] = list(islice(reversed(other_lines), last_n))
+            lines.reverse()
+        else:
+            lines = [*system_lines, *other_lines][-last_n:]
 
-        context_parts = []
-        for msg in recent_messages:
-            role_label = "用户" if msg.role == "user" else "助手"
-            context_parts.append(f"{role_label}: {msg.content}")
+        if not lines:
+            return ""
 
-        return "\n".join(context_parts)
+        context = "\n".join(lines)
+        self._context_cache.setdefault(session_id, {})[last_n] = context
+        return context
 
     def clear_session(self, session_id: str) -> None:
         """清除会话。"""
         if session_id in self._sessions:
             del self._sessions[session_id]
+        self._context_lines.pop(session_id, None)
+        self._context_cache.pop(session_id, None)
 
     def get_session_count(self) -> int:
         """获取活跃会话数。"""
@@ -151,10 +289,24 @@ class LongTermMemory:
     存储用户的长期信息，包括偏好、历史交互摘要等。
     """
 
-    def __init__(self):
-        """初始化长期记忆。"""
+    def __init__(self, max_interactions: int = 1000):
+        """初始化长期记忆。
+
+        Args:
+            max_interactions: 每个用户保留的最大交互记录数，超出时淘汰最旧的记录
+        """
+        self.max_interactions = max_interactions
         self._profiles: Dict[str, UserProfile] = {}
-        self._interaction_history: Dict[str, List[Dict[str, Any]]] = {}
+        self._interaction_history: Dict[str, Deque[Interaction]] = {}
+        # 与交互记录一一对应的小写检索文本，供 search_memory 使用（同步淘汰）
+        self._search_blobs: Dict[str, Deque[str]] = {}
+        # 累计交互次数（不受保留上限影响）
+        self._interaction_counts: Dict[str, int] = {}
+        # 摘要所需的聚合数据，随 save_interaction 增量更新
+        self._intent_counters: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._recent_emotions: Dict[str, Deque[str]] = defaultdict(
+            lambda: deque(maxlen=5)
+        )
         self._memory_summary: Dict[str, str] = {}  # 用户记忆摘要
 
     def get_or_create_profile(self, user_id: str) -> UserProfile:
@@ -166,10 +318,12 @@ class LongTermMemory:
         Returns:
             用户画像
         """
-        if user_id not in self._profiles:
-            self._profiles[user_id] = UserProfile(user_id=user_id)
+        # 已有画像只需一次字典查找
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            profile = self._profiles[user_id] = UserProfile(user_id=user_id)
 
-        return self._profiles[user_id]
+        return profile
 
     def update_profile(self, user_id: str, **kwargs) -> UserProfile:
         """更新用户画像。
@@ -214,47 +368,67 @@ class LongTermMemory:
             emotion: 检测到的情绪
             metadata: 附加元数据
         """
-        if user_id not in self._interaction_history:
-            self._interaction_history[user_id] = []
-
-        record = {
-            "timestamp": datetime.now().isoformat(),
-            "message": message,
-            "response": response,
-            "intent": intent,
-            "emotion": emotion,
-            "metadata": metadata or {},
-        }
+        # 每个用户的容器只查找一次，之后通过局部变量访问
+        history = self._interaction_history.get(user_id)
+        if history is None:
+            history = self._interaction_history[user_id] = deque(
+                maxlen=self.max_interactions
+            )
+            blobs = self._search_blobs[user_id] = deque(maxlen=self.max_interactions)
+        else:
+            blobs = self._search_blobs[user_id]
+
+        history.append(
+            Interaction(
+                timestamp=time.time_ns(),
+                message=message,
+                response=response,
+                intent=intent,
+                emotion=emotion,
+                metadata=metadata or {},
+            )
+        )
+        # 预先小写化并拼接，搜索时每条记录只需一次子串检查；
+        # 分隔符避免查询跨越消息与回复的边界
+        blobs.append(f"{message}\x01{response}".lower())
+        count = self._interaction_counts.get(user_id, 0) + 1
+        self._interaction_counts[user_id] = count
 
-        self._interaction_history[user_id].append(record)
+        if intent:
+            self._intent_counters[user_id][intent] += 1
+        if emotion:
+            self._recent_emotions[user_id].append(emotion)
 
         # 定期更新记忆摘要
-        if len(self._interaction_history[user_id]) % 10 == 0:
+        if count % 10 == 0:
             self._update_memory_summary(user_id)
 
     def _update_memory_summary(self, user_id: str) -> None:
-        """更新用户记忆摘要。"""
-        history = self._interaction_history.get(user_id, [])
+        """更新用户记忆摘要。
 
-        if not history:
-            return
+        基于增量维护的意图计数和近期情绪生成，不重新扫描历史记录。
+        """
+        count = self._interaction_counts.get(user_id, 0)
 
-        # 提取关键信息
-        intents = [h["intent"] for h in history if h.get("intent")]
-        emotions = [h["emotion"] for h in history if h.get("emotion")]
+        if not count:
+            return
 
         # 生成摘要（简化版，生产环境应使用LLM生成）
         summary_parts = []
 
-        if intents:
-            top_intents = ", ".join(set(intents[-5:]))
+        intent_counter = self._intent_counters.get(user_id)
+        if intent_counter:
+            top_intents = ", ".join(
+                intent for intent, _ in intent_counter.most_common(5)
+            )
             summary_parts.append(f"常见意图: {top_intents}")
 
-        if emotions:
-            top_emotions = ", ".join(set(emotions[-5:]))
+        recent_emotions = self._recent_emotions.get(user_id)
+        if recent_emotions:
+            top_emotions = ", ".join(dict.fromkeys(recent_emotions))
             summary_parts.append(f"近期情绪: {top_emotions}")
 
-        summary_parts.append(f"交互次数: {len(history)}")
+        summary_parts.append(f"交互次数: {count}")
 
         self._memory_summary[user_id] = "; ".join(summary_parts)
 
@@ -264,12 +438,19 @@ class LongTermMemory:
 
     def get_recent_interactions(
         self, user_id: str, limit: int = 10
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Interaction]:
         """获取最近的交互记录。"""
-        history = self._interaction_history.get(user_id, [])
-        return history[-limit:] if history else []
-
-    def search_memory(self, user_id: str, query: str) -> List[Dict[str, Any]]:
+        history = self._interaction_history.get(user_id)
+        if not history or limit <= 0:
+            return []
+        if limit >= len(history):
+            # 全部记录都在范围内，直接整体复制
+            return list(history)
+        recent = list(islice(reversed(history), limit))
+        recent.reverse()
+        return recent
+
+    def search_memory(self, user_id: str, query: str) -> List[Interaction]:
         """搜索用户记忆。
 
         简化版实现，生产环境应使用向量检索。
@@ -281,18 +462,18 @@ class LongTermMemory:
         Returns:
             相关的交互记录
         """
-        history = self._interaction_history.get(user_id, [])
+        history = self._interaction_history.get(user_id, ())
+        blobs = self._search_blobs.get(user_id, ())
         query_lower = query.lower()
 
-        results = []
-        for record in history:
-            if (
-                query_lower in record.get("message", "").lower()
-                or query_lower in record.get("response", "").lower()
-            ):
-                results.append(record)
+        # 从最新的记录向前查找，找满10条即停止；子串检查和筛选都在C层迭代器中完成
+        matches = compress(
+            reversed(history), map(contains, reversed(blobs), repeat(query_lower))
+        )
+        results = list(islice(matches, 10))
 
-        return results[-10:]  # 返回最近10条
+        results.reverse()
+        return results  # 返回最近10条
 
 
 class MemorySystem:
@@ -322,7 +503,7 @@ class MemorySystem:
         """添加用户消息。"""
         self.short_term.add_message(
             session_id=session_id,
-            role="user",
+            role=_ROLE_USER,
             content=content,
         )
 
@@ -337,7 +518,7 @@ class MemorySystem:
         """添加助手消息。"""
         self.short_term.add_message(
             session_id=session_id,
-            role="assistant",
+            role=_ROLE_ASSISTANT,
             content=content,
             metadata={"intent": intent, "emotion": emotion},
         )
@@ -351,6 +532,52 @@ class MemorySystem:
             emotion=emotion,
         )
 
+    def add_turn(
+        self,
+        session_id: str,
+        user_id: str,
+        user_msg: str,
+        assistant_msg: str,
+        *,
+        intent: Optional[str] = None,
+        emotion: Optional[str] = None,
+    ) -> None:
+        """添加一轮完整对话（用户消息 + 助手回复）。
+
+        两条消息一次写入短期记忆，并合并为一条长期交互记录，
+        替代先后调用 add_user_message 和 add_assistant_message。
+
+        Args:
+            session_id: 会话ID
+            user_id: 用户ID
+            user_msg: 用户消息
+            assistant_msg: 助手回复
+            intent: 识别的意图
+            emotion: 检测到的情绪
+        """
+        # 同一轮的两条消息共用一个时间戳，只读取一次时钟
+        now = time.time_ns()
+        self.short_term.add_messages(
+            session_id,
+            [
+                Message(role=_ROLE_USER, content=user_msg, timestamp_ns=now),
+                Message(
+                    role=_ROLE_ASSISTANT,
+                    content=assistant_msg,
+                    timestamp_ns=now,
+                    metadata={"intent": intent, "emotion": emotion},
+                ),
+            ],
+        )
+
+        self.long_term.save_interaction(
+            user_id=user_id,
+            message=user_msg,
+            response=assistant_msg,
+            intent=intent,
+            emotion=emotion,
+        )
+
     def get_conversation_context(
         self,
         session_id: str,
@@ -385,13 +612,10 @@ class MemorySystem:
         return self.long_term.update_profile(user_id, **kwargs)
 
 
-# 全局实例
-_memory_system: Optional[MemorySystem] = None
+# 全局实例（导入时创建，本身只是几个空字典，无需延迟初始化）
+_memory_system = MemorySystem()
 
 
 def get_memory_system() -> MemorySystem:
     """获取记忆系统单例。"""
-    global _memory_system
-    if _memory_system is None:
-        _memory_system = MemorySystem()
     return _memory_system
@@ -2,6 +2,7 @@
 
 from src.tools.base import BaseTool, ToolResult, ToolRegistry
 from src.tools.crisis import CrisisDetector, CrisisDetectionResult, get_crisis_detector
+from src.tools.keyword_matcher import KeywordMatcher
 from src.tools.rag import (
     KnowledgeBaseRetriever,
     RetrievalResult,
@@ -22,6 +23,8 @@ __all__ = [
     "CrisisDetector",
     "CrisisDetectionResult",
     "get_crisis_detector",
+    # Keyword matching
+    "KeywordMatcher",
     # RAG
     "KnowledgeBaseRetriever",
     "RetrievalResult",
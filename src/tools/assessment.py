@@ -1,13 +1,17 @@
 """Psychological assessment tool."""
 
 import logging
+import math
+from bisect import bisect_left
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from itertools import repeat
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssessmentQuestion:
     """评估问题。"""
 
@@ -18,7 +22,7 @@ class AssessmentQuestion:
     reverse_scored: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AssessmentResult:
     """评估结果。"""
 
@@ -183,9 +187,134 @@ class PsychologicalAssessmentTool:
         },
     }
 
-    def __init__(self):
-        """初始化评估工具。"""
-        self._assessment_history: Dict[str, List[AssessmentResult]] = {}
+    # 各评估类型、严重程度对应的建议
+    RECOMMENDATIONS = {
+        "anxiety": {
+            "minimal": [
+                "继续保持良好的生活习惯",
+                "规律作息和适量运动有助于维持心理健康",
+            ],
+            "mild": ["可以尝试一些放松技巧，如深呼吸", "建议关注压力源并尝试调整"],
+            "moderate": [
+                "建议学习系统的焦虑管理技巧",
+                "可以考虑寻求心理咨询师的帮助",
+            ],
+            "severe": [
+                "建议尽快联系专业心理咨询师或医生",
+                "如果症状影响日常生活，请及时就医",
+            ],
+        },
+        "depression": {
+            "minimal": ["保持积极的生活态度和社交活动", "适度运动有助于提升情绪"],
+            "mild": ["建议增加社交活动和兴趣爱好", "尝试记录感恩日记"],
+            "moderate": ["建议寻求专业心理帮助", "可以尝试认知行为疗法"],
+            "severe": ["强烈建议立即寻求专业帮助", "请联系心理咨询师或精神科医生"],
+        },
+        "stress": {
+            "low": ["压力管理水平良好", "继续保持健康的生活方式"],
+            "moderate": ["建议学习压力管理技巧", "尝试冥想或深呼吸练习"],
+            "high": ["建议立即采取措施管理压力", "考虑寻求专业支持"],
+        },
+    }
+
+    # 未知评估类型或严重程度时的建议
+    DEFAULT_RECOMMENDATIONS = ["建议咨询专业人士"]
+
+    # 严重程度 -> 风险等级（未列出的为 low）
+    RISK_LEVELS = {"mild": "medium", "moderate": "high", "severe": "high"}
+
+    def __init__(self, max_history: int = 100):
+        """初始化评估工具。
+
+        Args:
+            max_history: 每个用户保留的最大评估记录数，超出时淘汰最旧的记录
+        """
+        self.max_history = max_history
+        self._assessment_history: Dict[str, Deque[AssessmentResult]] = {}
+        # 按类型划分的同一批记录: 用户ID -> {评估类型: 记录}，与总历史同步淘汰
+        self._history_by_type: Dict[str, Dict[str, Deque[AssessmentResult]]] = {}
+        self._scoring_tables = self._build_scoring_tables()
+        self._threshold_tables = self._build_threshold_tables()
+        self._outcome_tables = self._build_outcome_tables()
+
+    @classmethod
+    def _build_scoring_tables(
+        cls,
+    ) -> Dict[str, Tuple[Tuple[str, ...], Tuple[Tuple[str, int], ...], int]]:
+        """预先计算每种评估的计分信息。
+
+        模板是静态的，每道题的最高选项分和每套问卷的满分只需计算一次。
+        正向题和反向题分开存放（按列组织），正向题可直接求和。
+        计分信息单独存放，不写入模板本身（模板会原样返回给客户端）。
+
+        Returns:
+            {评估类型: (正向题ID元组, ((反向题ID, 最高选项分+1), ...), 满分)}
+        """
+        tables: Dict[
+            str, Tuple[Tuple[str, ...], Tuple[Tuple[str, int], ...], int]
+        ] = {}
+        for assessment_type, template in cls.ASSESSMENT_TEMPLATES.items():
+            forward_ids: List[str] = []
+            reverse_items: List[Tuple[str, int]] = []
+            max_score = 0
+            for question in template.get("questions", []):
+                max_option = max(opt["value"] for opt in question["options"])
+                max_score += max_option
+                if question.get("reverse_scored", False):
+                    reverse_items.append((question["id"], max_option + 1))
+                else:
+                    forward_ids.append(question["id"])
+            tables[assessment_type] = (
+                tuple(forward_ids),
+                tuple(reverse_items),
+                max_score,
+            )
+        return tables
+
+    @classmethod
+    def _build_threshold_tables(
+        cls,
+    ) -> Dict[str, Tuple[float, Tuple[float, ...], Tuple[str, ...]]]:
+        """将严重程度阈值转换为按上界排序的查找表。
+
+        末尾追加上界为无穷大的 "unknown" 档，超出最高档的分数无需额外判断。
+
+        Returns:
+            {评估类型: (最低分, (各档上界, ..., inf), (对应严重程度, ..., "unknown"))}
+        """
+        tables: Dict[str, Tuple[float, Tuple[float, ...], Tuple[str, ...]]] = {}
+        for assessment_type, thresholds in cls.SEVERITY_THRESHOLDS.items():
+            bands = sorted(thresholds.items(), key=lambda item: item[1])
+            tables[assessment_type] = (
+                bands[0][1][0],
+                (*(max_score for _, (_, max_score) in bands), math.inf),
+                (*(severity for severity, _ in bands), "unknown"),
+            )
+        return tables
+
+    @classmethod
+    def _build_outcome_tables(
+        cls,
+    ) -> Dict[str, Dict[str, Tuple[Tuple[str, ...], str]]]:
+        """预先计算每种评估各严重程度对应的建议和风险等级。
+
+        Returns:
+            {评估类型: {严重程度: (建议元组, 风险等级)}}，包含 "unknown"
+        """
+        tables: Dict[str, Dict[str, Tuple[Tuple[str, ...], str]]] = {}
+        for assessment_type in cls.ASSESSMENT_TEMPLATES:
+            recommendations = cls.RECOMMENDATIONS.get(assessment_type, {})
+            severities = [*cls.SEVERITY_THRESHOLDS.get(assessment_type, {}), "unknown"]
+            tables[assessment_type] = {
+                severity: (
+                    tuple(
+                        recommendations.get(severity, cls.DEFAULT_RECOMMENDATIONS)
+                    ),
+                    cls.RISK_LEVELS.get(severity, "low"),
+                )
+                for severity in severities
+            }
+        return tables
 
     def get_assessment_template(self, assessment_type: str) -> Dict[str, Any]:
         """获取评估问卷模板。
@@ -210,9 +339,9 @@ class PsychologicalAssessmentTool:
         Returns:
             评估结果
         """
-        template = self.get_assessment_template(assessment_type)
+        scoring = self._scoring_tables.get(assessment_type)
 
-        if not template:
+        if scoring is None:
             return AssessmentResult(
                 assessment_type=assessment_type,
                 score=0,
@@ -221,28 +350,18 @@ class PsychologicalAssessmentTool:
                 risk_level="low",
             )
 
-        questions = template.get("questions", [])
-
-        # 计算总分
-        total_score = 0
-        max_score = 0
-
-        for question in questions:
-            question_id = question["id"]
-            if question_id in answers:
-                value = answers[question_id]
+        forward_ids, reverse_items, max_score = scoring
 
-                # 处理反向计分
-                if question.get("reverse_scored", False):
-                    # 反向：选择最低值得最高分
-                    max_option = max(opt["value"] for opt in question["options"])
-                    value = (max_option + 1) - value
+        # 计算总分：正向题未作答按0分计，直接在C层求和
+        total_score = sum(map(answers.get, forward_ids, repeat(0)))
 
-                total_score += value
+        for question_id, reverse_base in reverse_items:
+            value = answers.get(question_id)
+            if value is None:
+                continue
 
-            # 计算最大可能分数
-            max_option = max(opt["value"] for opt in question["options"])
-            max_score += max_option
+            # 反向：选择最低值得最高分
+            total_score += reverse_base - value
 
         # 转换为百分制
         percentage = (total_score / max_score * 100) if max_score > 0 else 0
@@ -250,17 +369,14 @@ class PsychologicalAssessmentTool:
         # 确定严重程度
         severity = self._calculate_severity(assessment_type, percentage)
 
-        # 生成建议
-        recommendations = self._generate_recommendations(assessment_type, severity)
-
-        # 确定风险等级
-        risk_level = self._calculate_risk_level(severity)
+        # 建议和风险等级只取决于严重程度，查预先计算的结果表
+        recommendations, risk_level = self._outcome_tables[assessment_type][severity]
 
         result = AssessmentResult(
             assessment_type=assessment_type,
             score=round(percentage, 1),
             severity=severity,
-            recommendations=recommendations,
+            recommendations=list(recommendations),
             risk_level=risk_level,
         )
 
@@ -273,64 +389,31 @@ class PsychologicalAssessmentTool:
 
     def _calculate_severity(self, assessment_type: str, score: float) -> str:
         """计算严重程度。"""
-        thresholds = self.SEVERITY_THRESHOLDS.get(assessment_type, {})
+        table = self._threshold_tables.get(assessment_type)
+        if table is None:
+            return "unknown"
 
-        for severity, (min_score, max_score) in thresholds.items():
-            if min_score <= score <= max_score:
-                return severity
+        # 二分查找第一个上界不小于分数的档位。阈值表中相邻两档之间有空隙
+        # （如焦虑29与30之间），落在空隙中的小数分数有意归入下一档
+        min_score, upper_bounds, severities = table
+        if score < min_score:
+            return "unknown"
 
-        return "unknown"
+        return severities[bisect_left(upper_bounds, score)]
 
     def _generate_recommendations(
         self, assessment_type: str, severity: str
     ) -> List[str]:
-        """生成建议。"""
-
-        recommendations_map = {
-            "anxiety": {
-                "minimal": [
-                    "继续保持良好的生活习惯",
-                    "规律作息和适量运动有助于维持心理健康",
-                ],
-                "mild": ["可以尝试一些放松技巧，如深呼吸", "建议关注压力源并尝试调整"],
-                "moderate": [
-                    "建议学习系统的焦虑管理技巧",
-                    "可以考虑寻求心理咨询师的帮助",
-                ],
-                "severe": [
-                    "建议尽快联系专业心理咨询师或医生",
-                    "如果症状影响日常生活，请及时就医",
-                ],
-            },
-            "depression": {
-                "minimal": ["保持积极的生活态度和社交活动", "适度运动有助于提升情绪"],
-                "mild": ["建议增加社交活动和兴趣爱好", "尝试记录感恩日记"],
-                "moderate": ["建议寻求专业心理帮助", "可以尝试认知行为疗法"],
-                "severe": ["强烈建议立即寻求专业帮助", "请联系心理咨询师或精神科医生"],
-            },
-            "stress": {
-                "low": ["压力管理水平良好", "继续保持健康的生活方式"],
-                "moderate": ["建议学习压力管理技巧", "尝试冥想或深呼吸练习"],
-                "high": ["建议立即采取措施管理压力", "考虑寻求专业支持"],
-            },
-        }
+        """生成建议。
 
-        return recommendations_map.get(assessment_type, {}).get(
-            severity, ["建议咨询专业人士"]
-        )
+        与 calculate_score 共用预先构建的建议元组，返回可修改的副本。
+        """
+        outcome = self._outcome_tables.get(assessment_type, {}).get(severity)
+        return list(outcome[0] if outcome else self.DEFAULT_RECOMMENDATIONS)
 
     def _calculate_risk_level(self, severity: str) -> str:
         """计算风险等级。"""
-
-        high_risk = ["moderate", "severe"]
-        medium_risk = ["mild"]
-
-        if severity in high_risk:
-            return "high"
-        elif severity in medium_risk:
-            return "medium"
-
-        return "low"
+        return self.RISK_LEVELS.get(severity, "low")
 
     def save_assessment_result(self, user_id: str, result: AssessmentResult) -> None:
         """保存评估结果。
@@ -339,10 +422,23 @@ class PsychologicalAssessmentTool:
             user_id: 用户ID
             result: 评估结果
         """
-        if user_id not in self._assessment_history:
-            self._assessment_history[user_id] = []
+        history = self._assessment_history.get(user_id)
+        if history is None:
+            history = self._assessment_history[user_id] = deque(
+                maxlen=self.max_history
+            )
+            self._history_by_type[user_id] = {}
+        by_type = self._history_by_type[user_id]
 
-        self._assessment_history[user_id].append(result)
+        # 总历史已满时追加会淘汰最旧的一条，它也是所属类型中最旧的一条
+        if history and len(history) == self.max_history:
+            by_type[history[0].assessment_type].popleft()
+
+        history.append(result)
+        typed = by_type.get(result.assessment_type)
+        if typed is None:
+            typed = by_type[result.assessment_type] = deque(maxlen=self.max_history)
+        typed.append(result)
 
     def get_assessment_history(
         self, user_id: str, assessment_type: Optional[str] = None
@@ -354,14 +450,15 @@ class PsychologicalAssessmentTool:
             assessment_type: 可选的评估类型过滤
 
         Returns:
-            评估结果列表
+            评估结果列表（按时间顺序）
         """
-        results = self._assessment_history.get(user_id, [])
-
         if assessment_type:
-            results = [r for r in results if r.assessment_type == assessment_type]
+            # 按类型的索引在保存时维护，过滤查询无需扫描全部记录
+            results = self._history_by_type.get(user_id, {}).get(assessment_type)
+        else:
+            results = self._assessment_history.get(user_id)
 
-        return results
+        return list(results) if results else []
 
 
 # 全局实例
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """工具执行结果。"""
 
@@ -56,6 +56,8 @@ class ToolRegistry:
     def __init__(self):
         """初始化工具注册表。"""
         self._tools: Dict[str, BaseTool] = {}
+        # 工具描述和schema是静态的，注册时构建一次
+        self._tool_entries: Dict[str, Dict[str, Any]] = {}
 
     def register(self, tool: BaseTool) -> None:
         """注册工具。
@@ -64,6 +66,11 @@ class ToolRegistry:
             tool: 工具实例
         """
         self._tools[tool.name] = tool
+        self._tool_entries[tool.name] = {
+            "name": tool.name,
+            "description": tool.description,
+            "schema": tool.get_schema(),
+        }
 
     def get(self, name: str) -> BaseTool | None:
         """获取工具。
@@ -77,14 +84,13 @@ class ToolRegistry:
         return self._tools.get(name)
 
     def list_tools(self) -> list[Dict[str, Any]]:
-        """列出所有工具。"""
+        """列出所有工具。
+
+        返回缓存条目的副本，调用方修改结果不会影响注册表。
+        """
         return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "schema": tool.get_schema(),
-            }
-            for tool in self._tools.values()
+            {**entry, "schema": dict(entry["schema"])}
+            for entry in self._tool_entries.values()
         ]
 
     def execute_tool(self, name: str, **kwargs) -> ToolResult:
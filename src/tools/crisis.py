@@ -1,20 +1,70 @@
 """Crisis detection tool for mental health safety."""
 
 import logging
-import re
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import DefaultDict, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from src.core.constants import (
     CRISIS_KEYWORDS,
     PROFESSIONAL_HOTLINES,
     RiskLevel,
 )
+from src.tools.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# 各风险等级的处置建议
+_RECOMMENDATIONS: Dict[RiskLevel, str] = {
+    RiskLevel.LOW: "继续正常对话",
+    RiskLevel.MEDIUM: "给予情感支持，关注用户状态",
+    RiskLevel.HIGH: "强烈建议寻求专业帮助，提供热线信息",
+    RiskLevel.CRITICAL: "立即启动危机干预协议，确保用户安全",
+}
+
+# 各风险等级的危机响应模板，{hotlines} 处填入热线列表
+_CRISIS_RESPONSE_TEMPLATES: Dict[RiskLevel, str] = {
+    RiskLevel.CRITICAL: """我很担心你。
+
+听到你这样说，我真的很在乎你。请你记住：
+
+1. **你很重要** - 你的生命是宝贵的
+2. **帮助是有的** - 专业的心理咨询师可以帮助你
+3. **你不需要独自承受** - 有人愿意倾听和支持你
+
+**请立即联系以下热线：**
+{hotlines}
+
+如果你有具体计划或想法，请告诉你信任的人，或者直接拨打上述热线。
+
+记住：**你并不孤单，有人可以帮助你。**""",
+    RiskLevel.HIGH: """我听到你了。
+
+谢谢你愿意分享这些。我能感受到你现在的痛苦。重要的是：
+
+- **你值得被帮助**
+- **你的感受是重要的**
+- **寻求帮助是勇敢的表现**
+
+**专业支持可以帮到你：**
+{hotlines}
+
+如果你愿意，可以告诉我更多你的情况。或者，我建议你联系上面的热线，他们可以提供专业的支持。""",
+    RiskLevel.MEDIUM: """感谢你告诉我这些。
+
+我很高兴你愿意表达自己的感受。如果你觉得：
+- 难以承受
+- 需要更多支持
+
+**可以考虑寻求专业帮助：**
+{hotlines}
+
+我在这里陪着你，你想聊些什么都可以。""",
+}
+
+
+@dataclass(slots=True)
 class CrisisDetectionResult:
     """危机检测结果。"""
 
@@ -56,22 +106,47 @@ class CrisisDetector:
         self.keywords = keywords or CRISIS_KEYWORDS
         self.hotlines = hotlines or PROFESSIONAL_HOTLINES
 
-        # 预编译正则表达式以提高性能
-        self._compiled_patterns: dict[str, list[re.Pattern[str]]] = {}
-        self._compile_patterns()
-
-    def _compile_patterns(self) -> None:
-        """预编译所有关键词的正则表达式。"""
+        # 小写关键词 -> 它在（按类别顺序展开的）关键词表中的每次出现:
+        # (全局序号, 类别)。重复出现的关键词有多条记录，参与风险计数
+        positions: DefaultDict[str, List[Tuple[int, str]]] = defaultdict(list)
+        order = 0
         for category, keyword_list in self.keywords.items():
-            patterns: list[re.Pattern[str]] = []
             for keyword in keyword_list:
-                # 使用正则表达式确保精确匹配
-                try:
-                    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                    patterns.append(pattern)
-                except re.error as e:
-                    logger.warning(f"Failed to compile keyword '{keyword}': {e}")
-            self._compiled_patterns[category] = patterns
+                if keyword:
+                    positions[keyword.lower()].append((order, category))
+                    order += 1
+        self._keyword_positions: Dict[str, Tuple[Tuple[int, str], ...]] = {
+            keyword: tuple(entries) for keyword, entries in positions.items()
+        }
+        self._keyword_set: FrozenSet[str] = frozenset(self._keyword_positions)
+        # 全部关键词预编译为一个自动机，每条消息只做一次线性扫描
+        self._matcher = KeywordMatcher(self._keyword_set)
+
+        # 热线列表在初始化后不变，建议和危机响应在此一次性渲染
+        hotlines_text = "\n".join(
+            f"- {name}: {phone}" for name, phone in self.hotlines.items()
+        )
+        self._recommendations: Dict[RiskLevel, str] = {
+            risk_level: (
+                f"{base}\n\n专业热线：\n{hotlines_text}"
+                if risk_level in (RiskLevel.HIGH, RiskLevel.CRITICAL)
+                else base
+            )
+            for risk_level, base in _RECOMMENDATIONS.items()
+        }
+        self._crisis_responses: Dict[RiskLevel, str] = {
+            risk_level: template.format(hotlines=hotlines_text)
+            for risk_level, template in _CRISIS_RESPONSE_TEMPLATES.items()
+        }
+
+    @property
+    def scan_keywords(self) -> Set[str]:
+        """需要在（小写化的）消息中扫描的全部关键词。
+
+        供调用方将危机关键词与其他关键词合并为一次扫描，
+        再把命中结果交给 detect_from_keywords。
+        """
+        return set(self._keyword_set)
 
     def detect(self, message: str) -> CrisisDetectionResult:
         """检测消息中的危机信号。
@@ -82,45 +157,56 @@ class CrisisDetector:
         Returns:
             CrisisDetectionResult: 包含检测结果和风险等级
         """
-        if not message or not message.strip():
-            return CrisisDetectionResult(
-                detected=False,
-                risk_level=RiskLevel.LOW,
-                category=None,
-                matched_keywords=[],
-                recommendation="",
-            )
+        # isspace 直接判断，不必像 strip 那样复制字符串
+        if not message or message.isspace():
+            return self._no_crisis()
 
-        message_lower = message.lower()
-        matched_keywords: List[str] = []
-        detected_category: Optional[str] = None
+        return self.detect_from_keywords(self._matcher.find(message.lower()))
 
-        # 检查每个类别的关键词
-        for category, patterns in self._compiled_patterns.items():
-            for pattern in patterns:
-                if pattern.search(message_lower):
-                    matched_keywords.append(pattern.pattern)
-                    if detected_category is None:
-                        detected_category = category
+    def detect_from_keywords(self, found: Set[str]) -> CrisisDetectionResult:
+        """根据已扫描出的关键词判定危机信号。
+
+        Args:
+            found: 在小写化消息中出现的关键词集合（可包含非危机关键词）
+
+        Returns:
+            CrisisDetectionResult: 包含检测结果和风险等级
+        """
+        # 绝大多数消息不含危机关键词，一次集合运算即可排除
+        hits = self._keyword_set.intersection(found)
+        if not hits:
+            return self._no_crisis()
+
+        # 只对命中的关键词按其在关键词表中的位置排序，
+        # 即可得到逐类别、逐关键词检查时的命中顺序，无需遍历关键词表
+        occurrences = sorted(
+            (order, category, keyword)
+            for keyword in hits
+            for order, category in self._keyword_positions[keyword]
+        )
+        matched_keywords = [keyword for _, _, keyword in occurrences]
+        detected_category = occurrences[0][1]
 
         # 确定风险等级
-        if detected_category is not None:
-            risk_level = self._calculate_risk_level(detected_category, matched_keywords)
-            recommendation = self._get_recommendation(risk_level)
+        risk_level = self._calculate_risk_level(detected_category, matched_keywords)
+        recommendation = self._get_recommendation(risk_level)
 
-            logger.warning(
-                f"Crisis detected: category={detected_category}, "
-                f"risk={risk_level.value}, keywords={matched_keywords}"
-            )
+        logger.warning(
+            f"Crisis detected: category={detected_category}, "
+            f"risk={risk_level.value}, keywords={matched_keywords}"
+        )
 
-            return CrisisDetectionResult(
-                detected=True,
-                risk_level=risk_level,
-                category=detected_category,
-                matched_keywords=matched_keywords,
-                recommendation=recommendation,
-            )
+        return CrisisDetectionResult(
+            detected=True,
+            risk_level=risk_level,
+            category=detected_category,
+            matched_keywords=matched_keywords,
+            recommendation=recommendation,
+        )
 
+    @staticmethod
+    def _no_crisis() -> CrisisDetectionResult:
+        """构建未检测到危机的结果。"""
         return CrisisDetectionResult(
             detected=False,
             risk_level=RiskLevel.LOW,
@@ -154,24 +240,7 @@ class CrisisDetector:
 
     def _get_recommendation(self, risk_level: RiskLevel) -> str:
         """根据风险等级获取建议。"""
-
-        hotlines_text = "\n".join(
-            f"- {name}: {phone}" for name, phone in self.hotlines.items()
-        )
-
-        recommendations = {
-            RiskLevel.LOW: "继续正常对话",
-            RiskLevel.MEDIUM: "给予情感支持，关注用户状态",
-            RiskLevel.HIGH: "强烈建议寻求专业帮助，提供热线信息",
-            RiskLevel.CRITICAL: "立即启动危机干预协议，确保用户安全",
-        }
-
-        base = recommendations.get(risk_level, "")
-
-        if risk_level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
-            return f"{base}\n\n专业热线：\n{hotlines_text}"
-
-        return base
+        return self._recommendations.get(risk_level, "")
 
     def get_crisis_response(self, result: CrisisDetectionResult) -> str:
         """生成危机响应消息。
@@ -185,55 +254,10 @@ class CrisisDetector:
         if not result.detected:
             return ""
 
-        responses = {
-            RiskLevel.CRITICAL: """我很担心你。
-
-听到你这样说，我真的很在乎你。请你记住：
-
-1. **你很重要** - 你的生命是宝贵的
-2. **帮助是有的** - 专业的心理咨询师可以帮助你
-3. **你不需要独自承受** - 有人愿意倾听和支持你
-
-**请立即联系以下热线：**
-{hotlines}
-
-如果你有具体计划或想法，请告诉你信任的人，或者直接拨打上述热线。
-
-记住：**你并不孤单，有人可以帮助你。**""",
-            RiskLevel.HIGH: """我听到你了。
-
-谢谢你愿意分享这些。我能感受到你现在的痛苦。重要的是：
-
-- **你值得被帮助**
-- **你的感受是重要的**
-- **寻求帮助是勇敢的表现**
-
-**专业支持可以帮到你：**
-{hotlines}
-
-如果你愿意，可以告诉我更多你的情况。或者，我建议你联系上面的热线，他们可以提供专业的支持。""",
-            RiskLevel.MEDIUM: """感谢你告诉我这些。
-
-我很高兴你愿意表达自己的感受。如果你觉得：
-- 难以承受
-- 需要更多支持
-
-**可以考虑寻求专业帮助：**
-{hotlines}
-
-我在这里陪着你，你想聊些什么都可以。""",
-        }
-
-        hotlines_text = "\n".join(
-            f"- {name}: {phone}" for name, phone in self.hotlines.items()
+        return self._crisis_responses.get(
+            result.risk_level, self._crisis_responses[RiskLevel.MEDIUM]
         )
 
-        response_template = responses.get(
-            result.risk_level, responses[RiskLevel.MEDIUM]
-        )
-
-        return response_template.format(hotlines=hotlines_text)
-
     def should_trigger_immediate_response(self, result: CrisisDetectionResult) -> bool:
         """判断是否需要立即响应。
 
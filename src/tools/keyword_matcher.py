@@ -0,0 +1,135 @@
+"""Multi-keyword matcher based on an Aho-Corasick automaton."""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """将关键词按公共前缀合并为正则表达式。
+
+    与简单的 ``a|b|c`` 并集相比，正则引擎在每个位置只需沿首字符
+    对应的分支继续尝试，不必逐个比较全部关键词。
+
+    Args:
+        keywords: 非空关键词集合
+
+    Returns:
+        匹配任一关键词的正则表达式
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # 关键词结束标记
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        # 当前位置已是某个关键词的结尾，后续分支可选
+        return body + "?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """多关键词匹配器。
+
+    将所有关键词构建为一个Aho-Corasick自动机，对文本做一次线性扫描
+    即可找出其中出现的全部关键词（包括相互重叠、嵌套的关键词）。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """初始化匹配器。
+
+        Args:
+            keywords: 关键词列表（区分大小写，调用方负责统一大小写）
+        """
+        # 状态转移表、失败指针、每个状态命中的关键词
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        unique = {keyword for keyword in keywords if keyword}
+        for keyword in unique:
+            self._insert(keyword)
+        self._build_failure_links()
+
+        # 所有关键词的正则（按前缀合并），用C实现的正则引擎快速定位第一个
+        # 命中位置；大多数消息不含任何关键词，可以直接跳过自动机扫描
+        self._screen: Optional[re.Pattern[str]] = (
+            re.compile(_trie_pattern(unique)) if unique else None
+        )
+
+    def _insert(self, keyword: str) -> None:
+        """将关键词插入字典树。"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if keyword not in self._output[state]:
+            self._output[state] += (keyword,)
+
+    def _build_failure_links(self) -> None:
+        """广度优先构建失败指针，并合并后缀状态的输出。"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """找出文本中出现的所有关键词。
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            出现过的关键词集合
+        """
+        found: Set[str] = set()
+        if self._screen is None:
+            return found
+
+        # 第一个命中位置之前不可能有关键词出现，从该位置开始扫描即可
+        first = self._screen.search(text)
+        if first is None:
+            return found
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for char in text[first.start() :]:
+            # 每一步只做一次字典查找；子状态编号均大于0，查不到时回退到根
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if output[state]:
+                found.update(output[state])
+
+        return found
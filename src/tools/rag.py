@@ -1,14 +1,18 @@
 """RAG knowledge base retrieval tool."""
 
+import heapq
 import logging
+import re
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, DefaultDict, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievalResult:
     """检索结果。"""
 
@@ -41,22 +45,40 @@ class KnowledgeBaseRetriever:
         self,
         knowledge_base_path: str = "knowledge_base",
         top_k: int = 3,
+        result_cache_size: int = 512,
     ):
         """初始化知识库检索器。
 
         Args:
             knowledge_base_path: 知识库文件路径
             top_k: 返回最相关的k个结果
+            result_cache_size: 检索结果缓存容量，0表示不缓存
         """
         self.knowledge_base_path = Path(knowledge_base_path)
         self.top_k = top_k
         self._knowledge_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # 扁平文档列表（下标即doc_id，按加载顺序）和字符倒排索引：
+        # 字符 -> 包含该字符的doc_id集合。中文没有空格分词，而相关性按
+        # 子串匹配计算，按字符建索引才能保证候选集不漏掉任何命中文档
+        self._docs: List[Dict[str, Any]] = []
+        self._postings: DefaultDict[str, Set[int]] = defaultdict(set)
+        # 检索结果LRU缓存：(查询词, 类别, k) -> 结果。检索是确定性的，
+        # 对话中相似的查询反复出现，命中时跳过整轮打分和段落提取
+        self._result_cache: OrderedDict[
+            Tuple[Tuple[str, ...], Optional[str], int], Tuple[RetrievalResult, ...]
+        ] = OrderedDict()
+        self._result_cache_size = result_cache_size
 
         # 初始化知识库
         self._load_knowledge_base()
 
     def _load_knowledge_base(self) -> None:
         """加载知识库内容。"""
+        # 重新加载时从空索引开始重建，已缓存的检索结果失效
+        self._knowledge_cache = {}
+        self._docs = []
+        self._postings.clear()
+        self._result_cache.clear()
 
         # 定义知识库类别
         knowledge_categories = {
@@ -79,9 +101,15 @@ class KnowledgeBaseRetriever:
             for file_path in category_path.glob("*.md"):
                 try:
                     content = file_path.read_text(encoding="utf-8")
+                    # 加载时缓存小写内容，检索时不必每次重新分配；
+                    # 中文文档常无大写字母，此时直接共用原字符串，不额外占内存
+                    content_lower = content.lower()
+                    if content_lower == content:
+                        content_lower = content
                     documents.append(
                         {
                             "content": content,
+                            "content_lower": content_lower,
                             "source": str(
                                 file_path.relative_to(self.knowledge_base_path)
                             ),
@@ -94,6 +122,8 @@ class KnowledgeBaseRetriever:
 
             if documents:
                 self._knowledge_cache[category] = documents
+                for doc in documents:
+                    self._index_document(doc)
 
         logger.info(
             f"Loaded knowledge base: "
@@ -101,6 +131,31 @@ class KnowledgeBaseRetriever:
             f"{sum(len(docs) for docs in self._knowledge_cache.values())} documents"
         )
 
+    def _index_document(self, doc: Dict[str, Any]) -> None:
+        """将文档加入扁平列表并更新字符倒排索引。"""
+        doc_id = len(self._docs)
+        self._docs.append(doc)
+        for char in set(doc["content_lower"]):
+            self._postings[char].add(doc_id)
+
+    def _candidate_doc_ids(self, query_words: List[str]) -> Set[int]:
+        """返回可能包含任一查询词的文档ID集合。
+
+        包含某个词的文档必然包含该词的每个字符，因此对每个词取其各字符
+        倒排列表的交集，再对所有词取并集。
+
+        Args:
+            query_words: 小写查询词列表
+
+        Returns:
+            候选文档ID集合
+        """
+        candidates: Set[int] = set()
+        for word in query_words:
+            postings = [self._postings.get(char, set()) for char in set(word)]
+            candidates |= set.intersection(*postings)
+        return candidates
+
     def retrieve(
         self,
         query: str,
@@ -115,47 +170,96 @@ class KnowledgeBaseRetriever:
             top_k: 返回结果数量
 
         Returns:
-            检索结果列表
+            检索结果列表（结果对象在缓存命中时共享，调用方不应修改）
         """
-        results: List[RetrievalResult] = []
         k = top_k or self.top_k
+        query_words = query.lower().split()
 
-        # 确定要搜索的类别
-        categories_to_search = (
-            [category] if category else list(self._knowledge_cache.keys())
-        )
+        if not query_words:
+            return []
 
-        for cat in categories_to_search:
-            if cat not in self._knowledge_cache:
-                continue
+        # 结果只取决于切分后的查询词，多余空白不影响命中
+        key = (tuple(query_words), category, k)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return list(cached)
 
-            # 简单关键词匹配（生产环境应使用向量相似度）
-            for doc in self._knowledge_cache[cat]:
-                content = doc["content"]
-                query_lower = query.lower()
-
-                # 计算简单相关性分数
-                score = self._calculate_relevance(query_lower, content)
-
-                if score > 0:
-                    results.append(
-                        RetrievalResult(
-                            content=self._extract_relevant_section(content, query),
-                            source=doc["source"],
-                            relevance_score=score,
-                            metadata={
-                                "category": doc["category"],
-                                "description": doc["description"],
-                            },
-                        )
-                    )
+        results = self._rank(query, query_words, category, k)
+
+        if self._result_cache_size > 0:
+            self._result_cache[key] = tuple(results)
+            if len(self._result_cache) > self._result_cache_size:
+                self._result_cache.popitem(last=False)
 
-        # 按相关性排序
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
+        return results
 
-        return results[:k]
+    def _rank(
+        self,
+        query: str,
+        query_words: List[str],
+        category: Optional[str],
+        k: int,
+    ) -> List[RetrievalResult]:
+        """对候选文档打分并返回前k个检索结果。
 
-    def _calculate_relevance(self, query: str, content: str) -> float:
+        Args:
+            query: 用户查询
+            query_words: 小写查询词列表（非空）
+            category: 指定知识类别（可选）
+            k: 返回结果数量
+
+        Returns:
+            按相关性降序排列的检索结果列表
+        """
+        # 只对倒排索引给出的候选文档打分（生产环境应使用向量相似度），
+        # 按doc_id升序遍历，保持与逐类别扫描相同的加载顺序
+        scored: List[Tuple[float, Dict[str, Any]]] = []
+        perfect_matches = 0
+        for doc_id in sorted(self._candidate_doc_ids(query_words)):
+            doc = self._docs[doc_id]
+            if category and doc["category"] != category:
+                continue
+
+            # 计算简单相关性分数（查询只切分一次）
+            score = self._match_ratio(query_words, doc["content_lower"])
+            if score > 0:
+                scored.append((score, doc))
+                # 分数上限为1.0且同分按加载顺序排列，已有k个满分文档时
+                # 后续文档不可能进入前k，无需继续打分
+                if score >= 1.0:
+                    perfect_matches += 1
+                    if perfect_matches >= k:
+                        break
+
+        # 取相关性最高的k个（nlargest 与稳定排序后截取等价，同分保持加载顺序），
+        # 只为入选文档提取相关段落
+        top_docs = heapq.nlargest(k, scored, key=itemgetter(0))
+
+        # 每次检索只编译一次查询词正则，供入选文档定位相关段落
+        query_pattern = self._compile_query_pattern(query_words)
+
+        return [
+            RetrievalResult(
+                content=self._extract_relevant_section(
+                    doc["content"],
+                    query,
+                    content_lower=doc["content_lower"],
+                    query_pattern=query_pattern,
+                ),
+                source=doc["source"],
+                relevance_score=score,
+                metadata={
+                    "category": doc["category"],
+                    "description": doc["description"],
+                },
+            )
+            for score, doc in top_docs
+        ]
+
+    def _calculate_relevance(
+        self, query: str, content: str, *, content_lower: Optional[str] = None
+    ) -> float:
         """计算查询与内容的简单相关性分数。
 
         生产环境应使用向量嵌入进行语义相似度计算。
@@ -163,24 +267,50 @@ class KnowledgeBaseRetriever:
         Args:
             query: 查询关键词
             content: 文档内容
+            content_lower: 预先计算的小写内容（可选）
 
         Returns:
             相关性分数 0-1
         """
-        content_lower = content.lower()
-        query_words = query.split()
+        if content_lower is None:
+            content_lower = content.lower()
+        return self._match_ratio(query.split(), content_lower)
+
+    @staticmethod
+    def _match_ratio(query_words: List[str], content_lower: str) -> float:
+        """计算在小写内容中出现的查询词比例。
 
+        Args:
+            query_words: 已切分的查询词列表
+            content_lower: 小写文档内容
+
+        Returns:
+            相关性分数 0-1
+        """
         if not query_words:
             return 0.0
 
-        # 计算查询词在内容中出现的次数
-        match_count = sum(1 for word in query_words if word in content_lower)
+        # 计算查询词在内容中出现的次数（map + __contains__ 在C层完成循环）
+        match_count = sum(map(content_lower.__contains__, query_words))
 
         # 归一化分数
         return min(match_count / len(query_words), 1.0)
 
+    @staticmethod
+    def _compile_query_pattern(query_words: List[str]) -> Optional[re.Pattern]:
+        """将查询词编译为单个正则交替式，无查询词时返回None。"""
+        if not query_words:
+            return None
+        return re.compile("|".join(map(re.escape, query_words)))
+
     def _extract_relevant_section(
-        self, content: str, query: str, context_chars: int = 500
+        self,
+        content: str,
+        query: str,
+        context_chars: int = 500,
+        *,
+        content_lower: Optional[str] = None,
+        query_pattern: Optional[re.Pattern] = None,
     ) -> str:
         """提取与查询最相关的文档部分。
 
@@ -188,27 +318,26 @@ class KnowledgeBaseRetriever:
             content: 完整文档内容
             query: 用户查询
             context_chars: 提取的上下文字符数
+            content_lower: 预先计算的小写内容（可选）
+            query_pattern: 预先编译的查询词正则（可选）
 
         Returns:
             相关部分的内容
         """
-        query_words = query.lower().split()
+        if query_pattern is None:
+            query_pattern = self._compile_query_pattern(query.lower().split())
 
-        # 找到第一个相关词的位置
-        content_lower = content.lower()
-        first_match_pos = -1
-
-        for word in query_words:
-            pos = content_lower.find(word)
-            if pos != -1:
-                first_match_pos = pos
-                break
+        # 一次扫描找到任一查询词最早出现的位置
+        if content_lower is None:
+            content_lower = content.lower()
+        match = query_pattern.search(content_lower) if query_pattern else None
 
-        if first_match_pos == -1:
+        if match is None:
             # 如果没有精确匹配，返回文档开头
             return content[:context_chars]
 
         # 提取上下文
+        first_match_pos = match.start()
         start = max(0, first_match_pos - context_chars // 2)
         end = min(len(content), first_match_pos + context_chars)
 
@@ -0,0 +1,370 @@
+"""Tests for psychology master agent."""
+
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+from src.agents.psychology_master import AgentResponse, PsychologyMasterAgent
+from src.core.config import settings
+from src.core.constants import IntentType
+from src.memory.system import MemorySystem
+from src.tools.rag import RetrievalResult
+
+
+class FakeLLM:
+    """记录调用次数的假LLM客户端。"""
+
+    def __init__(self, temperature: float = 0.0):
+        self.temperature = temperature
+        self.calls = 0
+
+    def invoke(self, messages: List[BaseMessage]) -> AIMessage:
+        self.calls += 1
+        return AIMessage(content=f"回应{self.calls}")
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        return self.invoke(messages)
+
+
+class TestResponseCache:
+    """LLM响应缓存测试。"""
+
+    @pytest.fixture
+    def llm(self) -> FakeLLM:
+        """创建确定性（temperature=0）的假LLM。"""
+        return FakeLLM(temperature=0.0)
+
+    @pytest.fixture
+    def agent(self, llm: FakeLLM) -> PsychologyMasterAgent:
+        """创建使用假LLM的Agent。"""
+        return PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+    def test_identical_prompt_hits_cache(
+        self, agent: PsychologyMasterAgent, llm: FakeLLM
+    ):
+        """测试相同提示词只调用一次LLM。"""
+        first = agent.chat("user_1", "你好").content
+        second = agent.chat("user_1", "你好").content
+
+        assert first == second
+        assert llm.calls == 1
+        assert agent.cache_stats["hits"] == 1
+        assert agent.cache_stats["misses"] == 1
+
+    def test_different_prompt_misses_cache(
+        self, agent: PsychologyMasterAgent, llm: FakeLLM
+    ):
+        """测试不同提示词分别调用LLM。"""
+        agent.chat("user_1", "你好")
+        agent.chat("user_1", "早上好")
+
+        assert llm.calls == 2
+
+    def test_cache_evicts_least_recently_used(self, llm: FakeLLM):
+        """测试超出容量时淘汰最久未使用的条目。"""
+        agent = PsychologyMasterAgent(
+            memory_system=MemorySystem(), llm_client=llm, response_cache_size=1
+        )
+
+        agent.chat("user_1", "你好")
+        agent.chat("user_1", "早上好")
+        agent.chat("user_1", "你好")
+
+        assert llm.calls == 3
+
+    def test_non_deterministic_llm_is_not_cached(self):
+        """测试temperature>0时不使用缓存。"""
+        llm = FakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        agent.chat("user_1", "你好")
+        agent.chat("user_1", "你好")
+
+        assert llm.calls == 2
+        assert agent.cache_stats["hits"] == 0
+        assert agent.cache_stats["misses"] == 0
+
+
+class TestSemanticResponseCache:
+    """语义缓存接入测试。"""
+
+    @staticmethod
+    def embedder(text: str) -> List[float]:
+        """“心情”相关的消息映射到同一方向。"""
+        return [1.0, 0.0] if "心情" in text else [0.0, 1.0]
+
+    def test_paraphrase_reuses_response(self):
+        """测试近义共情消息复用回应。"""
+        llm = FakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(
+            memory_system=MemorySystem(), llm_client=llm, embedder=self.embedder
+        )
+
+        first = agent.chat("user_1", "我心情很差").content
+        second = agent.chat("user_2", "我的心情很差啊").content
+
+        assert first == second
+        assert llm.calls == 1
+        assert agent.cache_stats["semantic_hits"] == 1
+
+    def test_general_chat_is_not_semantically_cached(self):
+        """测试一般对话不使用语义缓存。"""
+        llm = FakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(
+            memory_system=MemorySystem(), llm_client=llm, embedder=self.embedder
+        )
+
+        agent.chat("user_1", "你好")
+        agent.chat("user_1", "你好呀")
+
+        assert llm.calls == 2
+
+
+class TestAsyncChat:
+    """异步对话测试。"""
+
+    async def test_achat_uses_async_llm(self):
+        """测试achat通过ainvoke生成响应。"""
+        llm = FakeLLM()
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        response = await agent.achat("user_1", "你好")
+
+        assert response.content == "回应1"
+        assert response.intent == IntentType.GENERAL_CHAT
+
+    async def test_achat_crisis_skips_llm(self):
+        """测试危机消息不调用LLM。"""
+        llm = FakeLLM()
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        response = await agent.achat("user_1", "我不想活了")
+
+        assert response.intent == IntentType.CRISIS_SIGNAL
+        assert llm.calls == 0
+
+    async def test_achat_falls_back_without_llm(self):
+        """测试未配置LLM时返回备用响应。"""
+        agent = PsychologyMasterAgent(memory_system=MemorySystem())
+
+        response = await agent.achat("user_1", "你好")
+
+        assert "我在这里倾听你" in response.content
+
+
+class SlowFakeLLM(FakeLLM):
+    """异步调用需要等待一段时间的假LLM客户端。"""
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        await asyncio.sleep(0.01)
+        return self.invoke(messages)
+
+
+class FailingFakeLLM(SlowFakeLLM):
+    """异步调用总是失败的假LLM客户端。"""
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("网络错误")
+
+
+class TestRequestCoalescing:
+    """并发相同请求合并测试。"""
+
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """测试同时到达的相同请求只调用一次LLM。"""
+        llm = SlowFakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        first, second = await asyncio.gather(
+            agent.achat("user_1", "你好"), agent.achat("user_2", "你好")
+        )
+
+        assert first.content == second.content
+        assert llm.calls == 1
+        assert agent.cache_stats["coalesced"] == 1
+        assert agent._inflight == {}
+
+    async def test_concurrent_different_requests_are_not_merged(self):
+        """测试不同请求各自调用LLM。"""
+        llm = SlowFakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        await asyncio.gather(
+            agent.achat("user_1", "你好"), agent.achat("user_2", "早上好")
+        )
+
+        assert llm.calls == 2
+
+    async def test_failure_falls_back_for_all_waiters(self):
+        """测试合并的请求失败时都返回备用响应。"""
+        agent = PsychologyMasterAgent(
+            memory_system=MemorySystem(), llm_client=FailingFakeLLM()
+        )
+
+        first, second = await asyncio.gather(
+            agent.achat("user_1", "你好"), agent.achat("user_2", "你好")
+        )
+
+        assert "我在这里倾听你" in first.content
+        assert "我在这里倾听你" in second.content
+        assert agent._inflight == {}
+
+
+class StreamingFakeLLM(FakeLLM):
+    """按片段流式输出的假LLM客户端。"""
+
+    async def astream(
+        self, messages: List[BaseMessage]
+    ) -> AsyncIterator[AIMessageChunk]:
+        self.calls += 1
+        for piece in ("你", "好", "呀"):
+            yield AIMessageChunk(content=piece)
+
+
+class TestStreamingChat:
+    """流式对话测试。"""
+
+    async def _collect(self, agent: PsychologyMasterAgent, message: str):
+        """收集增量片段和最终响应。"""
+        items = [item async for item in agent.astream_chat("user_1", message)]
+        return items[:-1], items[-1]
+
+    async def test_stream_yields_deltas_then_response(self):
+        """测试先产出增量片段，最后产出完整响应。"""
+        llm = StreamingFakeLLM(temperature=0.7)
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        deltas, final = await self._collect(agent, "早上好")
+
+        assert deltas == ["你", "好", "呀"]
+        assert isinstance(final, AgentResponse)
+        assert final.content == "你好呀"
+        assert final.intent == IntentType.GENERAL_CHAT
+
+        history = agent.memory_system.short_term.get_messages(
+            agent.current_session_id
+        )
+        assert history[-1].content == "你好呀"
+
+    async def test_stream_crisis_is_single_chunk(self):
+        """测试危机响应作为单个片段产出且不调用LLM。"""
+        llm = StreamingFakeLLM()
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        deltas, final = await self._collect(agent, "我不想活了")
+
+        assert deltas == [final.content]
+        assert final.intent == IntentType.CRISIS_SIGNAL
+        assert llm.calls == 0
+
+    async def test_stream_cached_response(self):
+        """测试temperature=0时第二次请求直接产出缓存内容。"""
+        llm = StreamingFakeLLM(temperature=0.0)
+        agent = PsychologyMasterAgent(memory_system=MemorySystem(), llm_client=llm)
+
+        await self._collect(agent, "早上好")
+        deltas, final = await self._collect(agent, "早上好")
+
+        assert deltas == ["你好呀"]
+        assert llm.calls == 1
+
+
+class FakeRetriever:
+    """返回固定检索结果的假知识库检索器。"""
+
+    def __init__(self, contents: List[str]):
+        self.contents = contents
+
+    def retrieve(self, query: str, top_k: int = 3) -> List[RetrievalResult]:
+        return [
+            RetrievalResult(
+                content=content,
+                source="fake",
+                relevance_score=1.0,
+                metadata={"description": "知识"},
+            )
+            for content in self.contents[:top_k]
+        ]
+
+
+class TestRagContext:
+    """RAG上下文构建测试。"""
+
+    def _agent(self, contents: List[str]) -> PsychologyMasterAgent:
+        return PsychologyMasterAgent(
+            memory_system=MemorySystem(), knowledge_retriever=FakeRetriever(contents)
+        )
+
+    def test_duplicate_results_are_merged(self):
+        """测试内容相同的检索结果只保留一份。"""
+        agent = self._agent(["深呼吸可以缓解焦虑", "深呼吸可以缓解焦虑"])
+        context = agent._get_rag_context("焦虑")
+
+        assert context.count("深呼吸可以缓解焦虑") == 1
+
+    def test_context_is_truncated(self, monkeypatch):
+        """测试单条内容和总长度按配置截断。"""
+        monkeypatch.setattr(settings, "max_rag_chunk_chars", 10)
+        monkeypatch.setattr(settings, "max_rag_context_chars", 30)
+
+        context = self._agent(["甲" * 50, "乙" * 50])._get_rag_context("焦虑")
+
+        assert "甲" * 10 in context
+        assert "甲" * 11 not in context
+        assert len(context) == 30
+
+
+class TestClassifyIntent:
+    """意图识别测试。"""
+
+    @pytest.fixture
+    def agent(self) -> PsychologyMasterAgent:
+        """创建无LLM的Agent。"""
+        return PsychologyMasterAgent(memory_system=MemorySystem())
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("什么是焦虑？", IntentType.KNOWLEDGE_QUERY),
+            ("焦虑怎么办", IntentType.KNOWLEDGE_QUERY),
+            ("可以教我冥想吗", IntentType.PRACTICE_REQUEST),
+            ("我最近很难过", IntentType.HELP_SEEKING),
+            ("想找人倾诉一下", IntentType.EMOTIONAL_SUPPORT),
+            ("今天天气不错", IntentType.GENERAL_CHAT),
+        ],
+    )
+    def test_classify_intent(
+        self, agent: PsychologyMasterAgent, message: str, expected: IntentType
+    ):
+        """测试关键词按优先级映射到意图。"""
+        assert agent._classify_intent(message) == expected
+
+
+class TestInterventionResponse:
+    """干预练习响应测试。"""
+
+    @pytest.fixture
+    def agent(self) -> PsychologyMasterAgent:
+        """创建无LLM的Agent。"""
+        return PsychologyMasterAgent(memory_system=MemorySystem())
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("可以教我冥想吗", "正念呼吸练习"),
+            ("想练习放松一下", "4-7-8 呼吸法"),
+            ("有没有CBT练习", "思维记录表"),
+        ],
+    )
+    def test_chat_selects_exercise_from_scanned_keywords(
+        self, agent: PsychologyMasterAgent, message: str, expected: str
+    ):
+        """测试练习请求根据统一扫描的关键词（不区分大小写）选择练习。"""
+        response = agent.chat(user_id="u1", message=message)
+
+        assert response.intent == IntentType.PRACTICE_REQUEST
+        assert expected in response.content
+        assert response.content == agent._generate_intervention_response(message)
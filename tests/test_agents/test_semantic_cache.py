@@ -0,0 +1,55 @@
+"""Tests for semantic response cache."""
+
+from typing import Dict, List
+
+import pytest
+
+from src.agents.semantic_cache import SemanticCache
+
+# 人为构造的向量：前两个是近义查询，第三个无关
+VECTORS: Dict[str, List[float]] = {
+    "我很焦虑": [1.0, 0.0, 0.0],
+    "我好焦虑啊": [0.99, 0.05, 0.0],
+    "今天吃什么": [0.0, 0.0, 1.0],
+}
+
+
+def fake_embedder(text: str) -> List[float]:
+    """查表返回固定向量。"""
+    return VECTORS[text]
+
+
+class TestSemanticCache:
+    """SemanticCache tests."""
+
+    @pytest.fixture
+    def cache(self) -> SemanticCache:
+        """创建语义缓存实例。"""
+        return SemanticCache(fake_embedder, threshold=0.92, max_size=2)
+
+    def test_empty_cache_misses(self, cache: SemanticCache):
+        """测试空缓存不命中。"""
+        assert cache.lookup(cache.embed("我很焦虑")) is None
+
+    def test_similar_query_hits(self, cache: SemanticCache):
+        """测试近义查询命中。"""
+        cache.add(cache.embed("我很焦虑"), "回应A")
+
+        assert cache.lookup(cache.embed("我好焦虑啊")) == "回应A"
+
+    def test_unrelated_query_misses(self, cache: SemanticCache):
+        """测试无关查询不命中。"""
+        cache.add(cache.embed("我很焦虑"), "回应A")
+
+        assert cache.lookup(cache.embed("今天吃什么")) is None
+
+    def test_evicts_least_recently_used(self, cache: SemanticCache):
+        """测试超出容量时淘汰最久未使用的条目。"""
+        cache.add(cache.embed("我很焦虑"), "回应A")
+        cache.add(cache.embed("今天吃什么"), "回应B")
+        # 命中后"我很焦虑"变为最近使用
+        cache.lookup(cache.embed("我很焦虑"))
+        cache.add(cache.embed("我好焦虑啊"), "回应C")
+
+        assert len(cache) == 2
+        assert cache.lookup(cache.embed("今天吃什么")) is None
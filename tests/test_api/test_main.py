@@ -0,0 +1,183 @@
+"""Tests for FastAPI application endpoints."""
+
+from typing import AsyncIterator, List
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from starlette.datastructures import State
+
+import src.agents.psychology_master as agent_module
+import src.api.main as main_module
+from src.agents.psychology_master import (
+    PsychologyMasterAgent,
+    get_psychology_master_agent,
+)
+from src.api.main import app
+from src.memory.system import MemorySystem
+from src.tools.assessment import get_assessment_tool
+
+
+class AsyncOnlyFakeLLM:
+    """同步和异步调用返回不同内容的假LLM客户端。"""
+
+    temperature = 0.7
+
+    def invoke(self, messages: List[BaseMessage]) -> AIMessage:
+        return AIMessage(content="同步回应")
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        return AIMessage(content="异步回应")
+
+
+class StreamingFakeLLM:
+    """按片段流式输出的假LLM客户端。"""
+
+    temperature = 0.7
+
+    async def astream(
+        self, messages: List[BaseMessage]
+    ) -> AsyncIterator[AIMessageChunk]:
+        for piece in ("你", "好", "呀"):
+            yield AIMessageChunk(content=piece)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    """每个测试使用独立的应用状态，测试结束后自动恢复。"""
+    monkeypatch.setattr(app, "state", State())
+
+
+class TestChatEndpoint:
+    """聊天端点测试。"""
+
+    def test_lifespan_stores_agent_and_chat_awaits_achat(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试启动时创建Agent单例，/chat 走异步调用路径。"""
+        llm = AsyncOnlyFakeLLM()
+        monkeypatch.setattr(agent_module, "_agent", None)
+        monkeypatch.setattr(main_module, "get_llm_client", lambda: llm)
+
+        with TestClient(app) as client:
+            agent = app.state.agent
+            assert agent is get_psychology_master_agent()
+            assert agent.llm_client is llm
+
+            response = client.post(
+                "/chat",
+                json={"user_id": "user_1", "message": "你好", "session_id": "s1"},
+            )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["response"] == "异步回应"
+        assert body["intent"] == "general_chat"
+        assert body["session_id"] == "s1"
+
+
+class TestChatStreamEndpoint:
+    """流式聊天端点测试。"""
+
+    @pytest.fixture
+    def agent(self) -> PsychologyMasterAgent:
+        """使用流式假LLM的Agent，直接放入应用状态。"""
+        agent = PsychologyMasterAgent(
+            memory_system=MemorySystem(), llm_client=StreamingFakeLLM()
+        )
+        app.state.agent = agent
+        return agent
+
+    def _stream(self, message: str) -> str:
+        """发送流式请求并返回完整的事件流文本。"""
+        response = TestClient(app).post(
+            "/chat/stream",
+            json={"user_id": "user_1", "message": message, "session_id": "s1"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return response.text
+
+    def test_stream_sends_deltas_then_done(self, agent: PsychologyMasterAgent):
+        """测试逐段推送增量，最后推送附带意图和风险等级的结束事件。"""
+        body = self._stream("早上好")
+
+        assert body == (
+            'data: {"delta":"你"}\n\n'
+            'data: {"delta":"好"}\n\n'
+            'data: {"delta":"呀"}\n\n'
+            'data: {"done":true,"intent":"general_chat","risk_level":"low",'
+            '"session_id":"s1",'
+            '"tools_used":["crisis_detection","intent_classification"],'
+            '"metadata":{}}\n\n'
+        )
+
+    def test_stream_crisis_is_single_delta(self, agent: PsychologyMasterAgent):
+        """测试危机响应作为单个增量事件推送。"""
+        body = self._stream("我不想活了")
+
+        reply = agent.memory_system.short_term.get_messages("s1")[-1].content
+        assert body == (
+            f'data: {{"delta":{orjson.dumps(reply).decode()}}}\n\n'
+            'data: {"done":true,"intent":"crisis_signal","risk_level":"critical",'
+            '"session_id":"s1","tools_used":["crisis_detection"],'
+            '"metadata":{"crisis_category":"suicide",'
+            '"matched_keywords":"不想活了,不想活了"}}\n\n'
+        )
+
+    def test_stream_error_after_deltas(
+        self, agent: PsychologyMasterAgent, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试已推送增量后Agent出错，以error事件通知客户端。"""
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("存储失败")
+
+        monkeypatch.setattr(agent, "_finish_response", fail)
+
+        body = self._stream("早上好")
+
+        assert body == (
+            'data: {"delta":"你"}\n\n'
+            'data: {"delta":"好"}\n\n'
+            'data: {"delta":"呀"}\n\n'
+            'data: {"error":"处理消息时发生错误: 存储失败"}\n\n'
+        )
+
+
+class TestAssessmentTemplateEndpoint:
+    """评估模板端点测试。"""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+        """清空模板响应缓存的测试客户端。"""
+        monkeypatch.setattr(main_module, "_template_bodies", {})
+        return TestClient(app)
+
+    def test_template_body_is_cached(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试首次请求后直接返回缓存的模板字节。"""
+        expected = get_assessment_tool().get_assessment_template("anxiety")
+
+        first = client.get("/assessment/template/anxiety")
+        assert first.status_code == 200
+        assert first.json() == orjson.loads(orjson.dumps(expected))
+        assert main_module._template_bodies["anxiety"] == first.content
+
+        # 缓存命中时不再访问评估工具
+        monkeypatch.setattr(main_module, "get_assessment_tool", None)
+        second = client.get("/assessment/template/anxiety")
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["content-type"] == "application/json"
+
+    def test_unknown_template_is_not_cached(self, client: TestClient):
+        """测试未知评估类型返回404且不写入缓存。"""
+        for _ in range(2):
+            response = client.get("/assessment/template/unknown")
+            assert response.status_code == 404
+
+        assert main_module._template_bodies == {}
@@ -0,0 +1,63 @@
+"""Tests for DeepSeek LLM client."""
+
+import httpx
+import orjson
+import pytest
+from langchain_core.messages import HumanMessage
+
+import src.llm.client as client_module
+from src.llm.client import ChatDeepSeek
+
+
+def _sse(*frames: dict) -> bytes:
+    """构造SSE响应体。"""
+    body = "".join(f"data: {orjson.dumps(frame).decode()}\n\n" for frame in frames)
+    return (body + "data: [DONE]\n\n").encode()
+
+
+class TestStreaming:
+    """流式响应测试。"""
+
+    @pytest.fixture
+    def llm(self, monkeypatch) -> ChatDeepSeek:
+        """创建使用模拟传输层的客户端。"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert orjson.loads(request.content)["stream"] is True
+            return httpx.Response(
+                200,
+                content=_sse(
+                    {"choices": [{"delta": {"role": "assistant", "content": ""}}]},
+                    {"choices": [{"delta": {"content": "你"}}]},
+                    {"choices": [{"delta": {"content": "好"}}]},
+                ),
+            )
+
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(
+            client_module, "_http_client", httpx.Client(transport=transport)
+        )
+        monkeypatch.setattr(
+            client_module, "_async_http_client", httpx.AsyncClient(transport=transport)
+        )
+        return ChatDeepSeek(api_key="test")
+
+    def test_stream_yields_deltas(self, llm: ChatDeepSeek):
+        """测试同步流式调用逐段产出文本。"""
+        chunks = [chunk.content for chunk in llm.stream([HumanMessage("你好")])]
+
+        assert chunks == ["你", "好"]
+
+    async def test_astream_yields_deltas(self, llm: ChatDeepSeek):
+        """测试异步流式调用逐段产出文本。"""
+        chunks = [chunk.content async for chunk in llm.astream([HumanMessage("你好")])]
+
+        assert chunks == ["你", "好"]
+
+    @pytest.mark.parametrize(
+        "line",
+        ["", ": keep-alive", "data: [DONE]", 'data: {"choices": []}'],
+    )
+    def test_non_content_lines_are_skipped(self, line: str):
+        """测试非内容行不产出文本块。"""
+        assert ChatDeepSeek._parse_stream_line(line) is None
@@ -1,15 +1,20 @@
 """Tests for memory system."""
 
+import sys
+
 import pytest
 from datetime import datetime
 
 from src.memory.system import (
+    Interaction,
     Message,
     UserProfile,
     ShortTermMemory,
     LongTermMemory,
     MemorySystem,
+    format_timestamp,
     get_memory_system,
+    new_session_id,
 )
 
 
@@ -28,6 +33,36 @@ class TestMessage:
         assert message.content == "你好"
         assert message.metadata["intent"] == "greeting"
         assert isinstance(message.timestamp, datetime)
+        assert message.timestamp.timestamp() == pytest.approx(
+            message.timestamp_ns / 1e9
+        )
+
+
+class TestInteraction:
+    """Interaction record tests."""
+
+    def test_item_access_and_to_dict(self):
+        """测试按字段名访问与转换为字典。"""
+        record = Interaction(timestamp=1, message="你好", response="你好呀")
+
+        assert record["message"] == "你好"
+        assert record["intent"] is None
+        assert record.to_dict() == {
+            "timestamp": 1,
+            "message": "你好",
+            "response": "你好呀",
+            "intent": None,
+            "emotion": None,
+            "metadata": {},
+        }
+
+    def test_unknown_key_raises_key_error(self):
+        """测试非字段名（包括方法名）按字典语义抛出 KeyError。"""
+        record = Interaction(timestamp=1, message="你好", response="你好呀")
+
+        for key in ("unknown", "to_dict"):
+            with pytest.raises(KeyError):
+                record[key]
 
 
 class TestUserProfile:
@@ -148,6 +183,30 @@ class TestShortTermMemory:
         assert len(messages) == 1
         assert messages[0].role == "user"
 
+    @pytest.mark.parametrize("include_system", [True, False])
+    def test_iter_messages_matches_get_messages(
+        self, short_memory: ShortTermMemory, include_system: bool
+    ):
+        """测试 iter_messages 与 get_messages 给出相同顺序的消息。"""
+        short_memory.add_message(session_id="s", role="system", content="设定")
+        for i in range(3):
+            short_memory.add_message(session_id="s", role="user", content=f"消息{i}")
+
+        assert list(short_memory.iter_messages("s", include_system)) == (
+            short_memory.get_messages("s", include_system)
+        )
+        assert list(short_memory.iter_messages("nonexistent_session")) == []
+
+    def test_runtime_built_system_role_is_recognized(
+        self, short_memory: ShortTermMemory
+    ):
+        """测试运行时拼出的角色字符串经驻留后仍被识别为系统消息。"""
+        role = "".join(["sys", "tem"])
+        short_memory.add_message(session_id="session_1", role=role, content="设定")
+
+        assert short_memory.get_messages("session_1", include_system=False) == []
+        assert short_memory.get_messages("session_1")[0].role is sys.intern("system")
+
     def test_get_conversation_context(self, short_memory: ShortTermMemory):
         """测试获取对话上下文。"""
         short_memory.add_message(
@@ -186,6 +245,52 @@ class TestShortTermMemory:
         assert "消息12" in context
         assert "消息14" in context
 
+    @pytest.mark.parametrize("last_n", [0, 1, 3, 4, 5, 10])
+    def test_get_conversation_context_tail_with_system_messages(
+        self, short_memory: ShortTermMemory, last_n: int
+    ):
+        """测试带系统消息时最近n条的截取与完整消息列表切片一致。"""
+        short_memory.add_message(session_id="s", role="system", content="设定")
+        for i in range(4):
+            short_memory.add_message(session_id="s", role="user", content=f"消息{i}")
+
+        expected = "\n".join(
+            f"{m.role_label}: {m.content}"
+            for m in short_memory.get_messages("s")[-last_n:]
+        )
+
+        assert short_memory.get_conversation_context("s", last_n=last_n) == expected
+
+    def test_get_conversation_context_refreshes_after_new_message(
+        self, short_memory: ShortTermMemory
+    ):
+        """测试缓存的上下文在会话新增消息后失效。"""
+        short_memory.add_message(session_id="session_1", role="user", content="你好")
+        assert short_memory.get_conversation_context("session_1") == "用户: 你好"
+
+        short_memory.add_message(
+            session_id="session_1", role="assistant", content="你好呀"
+        )
+
+        assert short_memory.get_conversation_context("session_1") == (
+            "用户: 你好\n助手: 你好呀"
+        )
+
+    def test_get_conversation_context_follows_evicted_messages(
+        self, short_memory: ShortTermMemory
+    ):
+        """测试超出 max_messages 后，预渲染的上下文行与保留的消息同步淘汰。"""
+        short_memory.add_message(session_id="s", role="system", content="设定")
+        for i in range(8):
+            short_memory.add_message(session_id="s", role="user", content=f"消息{i}")
+
+        expected = "\n".join(
+            f"{m.role_label}: {m.content}" for m in short_memory.get_messages("s")
+        )
+
+        assert short_memory.get_conversation_context("s", last_n=0) == expected
+        assert "消息2" not in expected
+
     def test_clear_session(self, short_memory: ShortTermMemory):
         """测试清除会话。"""
         short_memory.add_message(
@@ -305,6 +410,20 @@ class TestLongTermMemory:
 
         recent = long_memory.get_recent_interactions("user_123", limit=3)
         assert len(recent) == 3
+        assert [r["message"] for r in recent] == ["消息12", "消息13", "消息14"]
+
+    def test_interaction_history_is_bounded(self):
+        """测试交互记录超出上限时淘汰最旧的记录，累计次数不受影响。"""
+        memory = LongTermMemory(max_interactions=5)
+        for i in range(20):
+            memory.save_interaction(
+                user_id="user_123", message=f"消息{i}", response=f"回复{i}"
+            )
+
+        recent = memory.get_recent_interactions("user_123", limit=10)
+
+        assert [r["message"] for r in recent] == [f"消息{i}" for i in range(15, 20)]
+        assert "交互次数: 20" in memory.get_memory_summary("user_123")
 
     def test_search_memory(self, long_memory: LongTermMemory):
         """测试搜索记忆。"""
@@ -323,6 +442,19 @@ class TestLongTermMemory:
 
         assert len(results) >= 1
 
+    def test_search_memory_returns_latest_ten(self, long_memory: LongTermMemory):
+        """测试搜索按时间顺序返回最近10条，且不区分大小写。"""
+        for i in range(15):
+            long_memory.save_interaction(
+                user_id="user_123",
+                message=f"Stress {i}",
+                response=f"回复{i}",
+            )
+
+        results = long_memory.search_memory("user_123", "stress")
+
+        assert [r["message"] for r in results] == [f"Stress {i}" for i in range(5, 15)]
+
     def test_search_memory_no_results(self, long_memory: LongTermMemory):
         """测试搜索无结果。"""
         results = long_memory.search_memory("user_123", "不存在的内容")
@@ -351,6 +483,25 @@ class TestLongTermMemory:
         summary = long_memory.get_memory_summary("user_123")
         assert "交互次数" in summary
 
+    def test_memory_summary_uses_running_aggregates(
+        self, long_memory: LongTermMemory
+    ):
+        """测试摘要按意图频次排序，并列出近期情绪。"""
+        for i in range(10):
+            long_memory.save_interaction(
+                user_id="user_123",
+                message=f"消息{i}",
+                response=f"回复{i}",
+                intent="help_seeking" if i < 7 else "knowledge_query",
+                emotion="anxious" if i < 5 else "calm",
+            )
+
+        summary = long_memory.get_memory_summary("user_123")
+
+        assert "常见意图: help_seeking, knowledge_query" in summary
+        assert "近期情绪: calm" in summary
+        assert "交互次数: 10" in summary
+
 
 class TestMemorySystem:
     """MemorySystem tests."""
@@ -396,6 +547,26 @@ class TestMemorySystem:
         history = memory_system.long_term.get_recent_interactions("user_123")
         assert len(history) == 1
 
+    def test_add_turn(self, memory_system: MemorySystem):
+        """测试一次写入一轮对话。"""
+        memory_system.add_turn(
+            "session_1",
+            "user_123",
+            "我最近压力大",
+            "我理解，能详细说说吗？",
+            intent="emotional_support",
+        )
+
+        messages = memory_system.short_term.get_messages("session_1")
+        assert [m.role for m in messages] == ["user", "assistant"]
+        assert messages[1].metadata["intent"] == "emotional_support"
+        assert messages[0].timestamp_ns == messages[1].timestamp_ns
+
+        history = memory_system.long_term.get_recent_interactions("user_123")
+        assert len(history) == 1
+        assert history[0]["message"] == "我最近压力大"
+        assert history[0]["response"] == "我理解，能详细说说吗？"
+
     def test_get_conversation_context(self, memory_system: MemorySystem):
         """测试获取对话上下文。"""
         # 添加一些消息
@@ -449,3 +620,30 @@ class TestMemorySystemSingleton:
         system2 = get_memory_system()
 
         assert system1 is system2
+
+
+class TestNewSessionId:
+    """会话ID生成测试。"""
+
+    def test_format_and_uniqueness(self):
+        """测试会话ID为32位十六进制且互不重复。"""
+        ids = {new_session_id() for _ in range(100)}
+
+        assert len(ids) == 100
+        assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
+
+
+class TestFormatTimestamp:
+    """交互时间戳格式化测试。"""
+
+    def test_saved_timestamp_round_trips(self):
+        """测试交互记录的整数时间戳可格式化为ISO时间。"""
+        memory = LongTermMemory()
+        before = datetime.now()
+        memory.save_interaction(user_id="user_123", message="你好", response="你好呀")
+
+        timestamp = memory.get_recent_interactions("user_123")[0]["timestamp"]
+
+        assert isinstance(timestamp, int)
+        parsed = datetime.fromisoformat(format_timestamp(timestamp))
+        assert abs((parsed - before).total_seconds()) < 5
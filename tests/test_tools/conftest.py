@@ -0,0 +1,59 @@
+"""Shared fixtures for tool tests."""
+
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+# 测试知识库的文档: (相对路径, UTF-8编码内容)，导入时编码一次
+_KB_FILES: List[Tuple[str, bytes]] = [
+    (
+        "psychology_basics/mental_health.md",
+        (
+            "心理健康是指个体心理在各方面都处于良好状态。\n"
+            "心理健康包括情绪稳定、行为适当、人际和谐等方面。\n"
+            "维护心理健康需要保持积极乐观的心态。"
+        ).encode("utf-8"),
+    ),
+    (
+        "psychology_basics/stress_management.md",
+        (
+            "压力管理是维护心理健康的重要手段。\n"
+            "有效的压力管理包括时间管理、放松技巧、社会支持等。\n"
+            "长期压力可能导致焦虑、抑郁等心理问题。"
+        ).encode("utf-8"),
+    ),
+    (
+        "therapy_techniques/cbt.md",
+        (
+            "认知行为疗法(CBT)是一种常用的心理治疗方法。\n"
+            "CBT强调认知、情绪和行为之间的相互作用。\n"
+            "通过改变负性思维模式来改善情绪状态。"
+        ).encode("utf-8"),
+    ),
+    (
+        "chinese_wisdom/daoist_psychology.md",
+        (
+            "道家思想强调顺其自然、无为而治。\n"
+            "道家心理学强调内心的平静与和谐。\n"
+            "无为不是无所作为，而是顺其自然。"
+        ).encode("utf-8"),
+    ),
+]
+
+
+@pytest.fixture(scope="session")
+def temp_knowledge_base(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """创建临时知识库目录。
+
+    测试只读取知识库，整个会话共用一份。tmp_path_factory 在 pytest-xdist
+    下会为每个worker分配独立的临时根目录，并行运行时各worker互不干扰。
+    """
+    knowledge_base = tmp_path_factory.mktemp("knowledge_base")
+
+    for relative_path, data in _KB_FILES:
+        path = knowledge_base / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    return knowledge_base
@@ -191,6 +191,31 @@ class TestPsychologicalAssessmentTool:
         # 4 + 4 + 4 = 12, 12/12*100 = 100, severe
         assert result.severity == "severe"
 
+    def test_calculate_score_skips_unanswered_questions(
+        self, assessment_tool: PsychologicalAssessmentTool
+    ):
+        """测试未作答题目（含反向计分题）不计分。"""
+        result = assessment_tool.calculate_score("depression", {"dep_1": 3})
+
+        # 只有 dep_1 计分: 3/12*100 = 25
+        assert result.score == 25.0
+
+    @pytest.mark.parametrize(
+        "score, expected",
+        [
+            (0, "minimal"),
+            (29, "minimal"),
+            (29.5, "mild"),
+            (40, "moderate"),
+            (100, "severe"),
+        ],
+    )
+    def test_calculate_severity_boundaries(
+        self, assessment_tool: PsychologicalAssessmentTool, score: float, expected: str
+    ):
+        """测试阈值边界和档位之间的小数分数。"""
+        assert assessment_tool._calculate_severity("anxiety", score) == expected
+
     def test_calculate_severity_out_of_range(
         self, assessment_tool: PsychologicalAssessmentTool
     ):
@@ -310,6 +335,52 @@ class TestPsychologicalAssessmentTool:
         assert len(anxiety_history) == 1
         assert anxiety_history[0].assessment_type == "anxiety"
 
+    def test_assessment_history_is_bounded(self):
+        """测试评估历史超出上限时淘汰最旧的记录。"""
+        assessment_tool = PsychologicalAssessmentTool(max_history=3)
+
+        for score in range(5):
+            assessment_tool.save_assessment_result(
+                "user_123",
+                AssessmentResult(
+                    assessment_type="anxiety",
+                    score=float(score),
+                    severity="minimal",
+                    recommendations=[],
+                    risk_level="low",
+                ),
+            )
+
+        history = assessment_tool.get_assessment_history("user_123")
+        assert [r.score for r in history] == [2.0, 3.0, 4.0]
+
+    def test_filtered_history_follows_eviction(self):
+        """测试按类型过滤的历史与总历史同步淘汰。"""
+        assessment_tool = PsychologicalAssessmentTool(max_history=3)
+        types = ["anxiety", "stress", "anxiety", "depression", "anxiety"]
+
+        for score, assessment_type in enumerate(types):
+            assessment_tool.save_assessment_result(
+                "user_123",
+                AssessmentResult(
+                    assessment_type=assessment_type,
+                    score=float(score),
+                    severity="minimal",
+                    recommendations=[],
+                    risk_level="low",
+                ),
+            )
+
+        history = assessment_tool.get_assessment_history("user_123")
+        for assessment_type in set(types):
+            filtered = assessment_tool.get_assessment_history(
+                "user_123", assessment_type
+            )
+            assert filtered == [
+                r for r in history if r.assessment_type == assessment_type
+            ]
+        assert assessment_tool.get_assessment_history("user_123", "stress") == []
+
     def test_get_assessment_history_no_results(
         self, assessment_tool: PsychologicalAssessmentTool
     ):
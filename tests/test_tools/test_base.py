@@ -0,0 +1,70 @@
+"""Tests for tool base classes and registry."""
+
+from typing import Any, Dict
+
+from src.tools.base import BaseTool, ToolRegistry, ToolResult
+
+
+class CountingTool(BaseTool):
+    """记录schema构建次数的测试工具。"""
+
+    name = "counting"
+    description = "测试工具"
+
+    def __init__(self):
+        self.schema_calls = 0
+
+    def execute(self, **kwargs) -> ToolResult:
+        return ToolResult(success=True, data=kwargs)
+
+    def get_schema(self) -> Dict[str, Any]:
+        self.schema_calls += 1
+        return {"type": "object", "properties": {}}
+
+
+class TestToolRegistry:
+    """工具注册表测试。"""
+
+    def test_list_tools_builds_schema_once(self):
+        """测试工具schema只在注册时构建一次。"""
+        registry = ToolRegistry()
+        tool = CountingTool()
+        registry.register(tool)
+
+        for _ in range(3):
+            tools = registry.list_tools()
+
+        assert tools == [
+            {
+                "name": "counting",
+                "description": "测试工具",
+                "schema": {"type": "object", "properties": {}},
+            }
+        ]
+        assert tool.schema_calls == 1
+
+    def test_list_tools_returns_copies(self):
+        """测试修改列出的工具信息不会影响后续调用。"""
+        registry = ToolRegistry()
+        registry.register(CountingTool())
+
+        tools = registry.list_tools()
+        tools[0]["name"] = "changed"
+        tools[0]["schema"]["type"] = "array"
+        tools.append({"name": "extra"})
+
+        assert registry.list_tools() == [
+            {
+                "name": "counting",
+                "description": "测试工具",
+                "schema": {"type": "object", "properties": {}},
+            }
+        ]
+
+    def test_execute_tool(self):
+        """测试执行已注册和未注册的工具。"""
+        registry = ToolRegistry()
+        registry.register(CountingTool())
+
+        assert registry.execute_tool("counting", x=1).data == {"x": 1}
+        assert registry.execute_tool("missing").success is False
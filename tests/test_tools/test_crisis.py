@@ -94,3 +94,44 @@ class TestCrisisDetector:
         detector2 = get_crisis_detector()
 
         assert detector1 is detector2
+
+    def test_detect_from_keywords_matches_detect(self):
+        """测试由预扫描关键词判定的结果与直接检测一致。"""
+        detector = CrisisDetector()
+        message = "我想自杀，感到很绝望"
+
+        found = {kw for kw in detector.scan_keywords if kw in message}
+        result = detector.detect_from_keywords(found | {"无关关键词"})
+
+        assert result.to_dict() == detector.detect(message).to_dict()
+
+    def test_matched_keywords_follow_category_order(self):
+        """测试跨类别命中时按类别顺序收集关键词，类别取第一个命中的类别。"""
+        detector = CrisisDetector(
+            keywords={
+                "suicide": ["想死"],
+                "self_harm": ["割腕", "伤害自己"],
+                "extreme_distress": ["绝望"],
+            }
+        )
+
+        result = detector.detect("绝望到想伤害自己")
+
+        assert result.category == "self_harm"
+        assert result.matched_keywords == ["伤害自己", "绝望"]
+
+    def test_all_keyword_occurrences_are_collected(self):
+        """测试重复关键词及后续类别的命中都被完整收集。"""
+        detector = CrisisDetector(
+            keywords={
+                "suicide": ["想死", "自杀", "想死"],
+                "self_harm": ["割腕"],
+                "extreme_distress": ["绝望"],
+            }
+        )
+
+        result = detector.detect("想死，想自杀，甚至割腕")
+
+        assert result.category == "suicide"
+        assert result.risk_level == RiskLevel.CRITICAL
+        assert result.matched_keywords == ["想死", "自杀", "想死", "割腕"]
@@ -0,0 +1,71 @@
+"""Tests for multi-keyword matcher."""
+
+import random
+
+from src.tools.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """KeywordMatcher tests."""
+
+    def test_find_single_keyword(self):
+        """测试找到单个关键词。"""
+        matcher = KeywordMatcher(["想死", "自杀"])
+
+        assert matcher.find("我想死") == {"想死"}
+
+    def test_find_overlapping_keywords(self):
+        """测试找到重叠和嵌套的关键词。"""
+        matcher = KeywordMatcher(["割腕", "想割腕", "不想活", "不想活了", "活了"])
+
+        assert matcher.find("我想割腕") == {"割腕", "想割腕"}
+        assert matcher.find("不想活了") == {"不想活", "不想活了", "活了"}
+
+    def test_find_after_partial_match(self):
+        """测试部分匹配失败后仍能通过失败指针继续匹配。"""
+        matcher = KeywordMatcher(["abcd", "bc"])
+
+        assert matcher.find("abce") == {"bc"}
+
+    def test_no_match(self):
+        """测试无匹配返回空集合。"""
+        matcher = KeywordMatcher(["焦虑"])
+
+        assert matcher.find("今天天气真好") == set()
+
+    def test_empty_keywords_and_text(self):
+        """测试空关键词被忽略、空文本返回空集合。"""
+        matcher = KeywordMatcher(["", "心情"])
+
+        assert matcher.find("") == set()
+        assert matcher.find("心情") == {"心情"}
+
+    def test_without_keywords(self):
+        """测试没有关键词时任何文本都无匹配。"""
+        assert KeywordMatcher([]).find("我想死") == set()
+
+    def test_matches_naive_substring_scan(self):
+        """测试结果与逐个关键词子串检查一致。"""
+        keywords = ["绝望", "极度绝望", "彻底绝望", "不想活了", "想死", "si", "suicide"]
+        matcher = KeywordMatcher(keywords)
+
+        for text in ("很好", "我彻底绝望想死", "thinking of suicide", "绝望绝望", "s"):
+            assert matcher.find(text) == {k for k in keywords if k in text}
+
+    def test_random_texts_match_naive_substring_scan(self):
+        """测试小字母表随机文本（频繁触发失败指针）与子串检查一致。"""
+        rng = random.Random(0)
+        keywords = ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(12)]
+        matcher = KeywordMatcher(keywords)
+
+        for _ in range(200):
+            text = "".join(rng.choices("abcd", k=rng.randint(0, 20)))
+            assert matcher.find(text) == {k for k in keywords if k in text}
+
+    def test_keywords_with_regex_metacharacters(self):
+        """测试首字符为正则字符类元字符的关键词同样能被匹配。"""
+        keywords = ["-x", "]y", "^z", "\\w", "[q"]
+        matcher = KeywordMatcher(keywords)
+
+        for text in ("a-x", "]y^z", "\\w", "[q", "xyz", "-]^\\["):
+            assert matcher.find(text) == {k for k in keywords if k in text}
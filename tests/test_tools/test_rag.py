@@ -1,11 +1,11 @@
 """Tests for RAG knowledge base retrieval tool."""
 
-import pytest
-import tempfile
-import shutil
 from pathlib import Path
-from typing import Any, Dict, Generator, List
+from typing import Optional
+
+import pytest
 
+import src.tools.rag as rag_module
 from src.tools.rag import (
     KnowledgeBaseRetriever,
     RetrievalResult,
@@ -50,50 +50,10 @@ class TestRetrievalResult:
 class TestKnowledgeBaseRetriever:
     """KnowledgeBaseRetriever tests."""
 
-    @pytest.fixture
-    def temp_knowledge_base(self) -> Generator[Path, None, None]:
-        """创建临时知识库目录。"""
-        temp_dir = tempfile.mkdtemp()
-        knowledge_base = Path(temp_dir) / "knowledge_base"
-
-        # 创建目录结构
-        (knowledge_base / "psychology_basics").mkdir(parents=True)
-        (knowledge_base / "therapy_techniques").mkdir(parents=True)
-        (knowledge_base / "chinese_wisdom").mkdir(parents=True)
-
-        # 创建测试文档
-        (knowledge_base / "psychology_basics" / "mental_health.md").write_text(
-            "心理健康是指个体心理在各方面都处于良好状态。\n"
-            "心理健康包括情绪稳定、行为适当、人际和谐等方面。\n"
-            "维护心理健康需要保持积极乐观的心态。",
-            encoding="utf-8",
-        )
-
-        (knowledge_base / "psychology_basics" / "stress_management.md").write_text(
-            "压力管理是维护心理健康的重要手段。\n"
-            "有效的压力管理包括时间管理、放松技巧、社会支持等。\n"
-            "长期压力可能导致焦虑、抑郁等心理问题。",
-            encoding="utf-8",
-        )
-
-        (knowledge_base / "therapy_techniques" / "cbt.md").write_text(
-            "认知行为疗法(CBT)是一种常用的心理治疗方法。\n"
-            "CBT强调认知、情绪和行为之间的相互作用。\n"
-            "通过改变负性思维模式来改善情绪状态。",
-            encoding="utf-8",
-        )
-
-        (knowledge_base / "chinese_wisdom" / "daoist_psychology.md").write_text(
-            "道家思想强调顺其自然、无为而治。\n"
-            "道家心理学强调内心的平静与和谐。\n"
-            "无为不是无所作为，而是顺其自然。",
-            encoding="utf-8",
-        )
-
-        yield knowledge_base
-
-        # 清理
-        shutil.rmtree(temp_dir)
+    @pytest.fixture(scope="module")
+    def retriever(self, temp_knowledge_base: Path) -> KnowledgeBaseRetriever:
+        """默认参数的检索器，供只读的测试共用。"""
+        return KnowledgeBaseRetriever(knowledge_base_path=str(temp_knowledge_base))
 
     def test_initialization(self, temp_knowledge_base: Path):
         """测试知识库初始化。"""
@@ -105,43 +65,35 @@ class TestKnowledgeBaseRetriever:
         assert retriever.top_k == 5
         assert len(retriever.list_categories()) == 3
 
-    def test_load_knowledge_base(self, temp_knowledge_base: Path):
+    def test_load_knowledge_base(self, retriever: KnowledgeBaseRetriever):
         """测试知识库加载。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
         categories = retriever.list_categories()
         assert "psychology_basics" in categories
         assert "therapy_techniques" in categories
         assert "chinese_wisdom" in categories
 
-    def test_retrieve_basic(self, temp_knowledge_base: Path):
-        """测试基础检索功能。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
+    def test_lowercase_content_shares_original_string(
+        self, retriever: KnowledgeBaseRetriever
+    ):
+        """测试无大写字母的文档不重复存储小写内容。"""
+        docs = retriever.get_knowledge_by_category("chinese_wisdom")
+        assert docs[0]["content_lower"] is docs[0]["content"]
 
-        results = retriever.retrieve("心理健康")
+        cbt = retriever.get_knowledge_by_category("therapy_techniques")[0]
+        assert cbt["content_lower"] == cbt["content"].lower()
+        assert cbt["content_lower"] is not cbt["content"]
 
-        assert len(results) > 0
-        assert all(isinstance(r, RetrievalResult) for r in results)
-
-    def test_retrieve_with_category_filter(self, temp_knowledge_base: Path):
-        """测试指定类别检索。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
-        # 只搜索心理科普类别
-        results = retriever.retrieve(
-            query="心理健康",
-            category="psychology_basics",
-        )
+    @pytest.mark.parametrize("category", [None, "psychology_basics"])
+    def test_retrieve_basic(
+        self, retriever: KnowledgeBaseRetriever, category: Optional[str]
+    ):
+        """测试基础检索，以及指定类别时只返回该类别的文档。"""
+        results = retriever.retrieve(query="心理健康", category=category)
 
         assert len(results) > 0
-        for r in results:
-            assert r.metadata["category"] == "psychology_basics"
+        assert all(isinstance(r, RetrievalResult) for r in results)
+        if category is not None:
+            assert all(r.metadata["category"] == category for r in results)
 
     def test_retrieve_with_top_k(self, temp_knowledge_base: Path):
         """测试top_k参数。"""
@@ -154,62 +106,120 @@ class TestKnowledgeBaseRetriever:
 
         assert len(results) <= 2
 
-    def test_retrieve_empty_query(self, temp_knowledge_base: Path):
-        """测试空查询返回空列表。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
-        results = retriever.retrieve("")
-
-        assert results == []
-
-    def test_retrieve_no_match(self, temp_knowledge_base: Path):
-        """测试无匹配结果。"""
+    def test_retrieve_returns_highest_scores_in_order(
+        self, retriever: KnowledgeBaseRetriever
+    ):
+        """测试top_k截取保留最高分结果并按分数降序排列。"""
+        all_results = retriever.retrieve("心理健康 压力 情绪", top_k=10)
+        top_results = retriever.retrieve("心理健康 压力 情绪", top_k=2)
+
+        scores = [r.relevance_score for r in all_results]
+        assert scores == sorted(scores, reverse=True)
+        assert [r.source for r in top_results] == [
+            r.source for r in all_results[:2]
+        ]
+
+    def test_retrieve_stops_after_k_perfect_matches(
+        self, retriever: KnowledgeBaseRetriever
+    ):
+        """测试满分文档提前截止后结果与完整排序一致。"""
+        all_results = retriever.retrieve("心理", top_k=10)
+        top_results = retriever.retrieve("心理", top_k=2)
+
+        assert all(r.relevance_score == 1.0 for r in all_results)
+        assert [r.source for r in top_results] == [
+            r.source for r in all_results[:2]
+        ]
+
+    def test_retrieve_caches_results(self, temp_knowledge_base: Path):
+        """测试相同查询词命中检索结果缓存。"""
         retriever = KnowledgeBaseRetriever(
             knowledge_base_path=str(temp_knowledge_base),
         )
 
-        # 使用完全不相关的查询
-        results = retriever.retrieve("量子物理 相对论")
+        first = retriever.retrieve("心理健康 压力")
+        second = retriever.retrieve("  心理健康   压力 ")
 
-        # 由于关键词匹配，可能返回空或低分结果
-        # 检查返回类型正确即可
-        assert isinstance(results, list)
+        assert second == first
+        assert second is not first
+        assert all(a is b for a, b in zip(first, second))
+        assert retriever.retrieve("心理健康 压力", top_k=1) == first[:1]
 
-    def test_calculate_relevance(self, temp_knowledge_base: Path):
-        """测试相关性计算。"""
+    def test_retrieve_cache_disabled(self, temp_knowledge_base: Path):
+        """测试缓存容量为0时不缓存结果。"""
         retriever = KnowledgeBaseRetriever(
             knowledge_base_path=str(temp_knowledge_base),
+            result_cache_size=0,
         )
 
-        # 完全匹配
-        score1 = retriever._calculate_relevance("心理健康", "心理健康是指...")
-        assert score1 == 1.0
+        first = retriever.retrieve("心理健康")
+        second = retriever.retrieve("心理健康")
 
-        # 部分匹配
-        score2 = retriever._calculate_relevance("心理 健康", "心理健康是指...")
-        assert score2 > 0
+        assert second == first
+        assert first[0] is not second[0]
 
-        # 无匹配
-        score3 = retriever._calculate_relevance("abc xyz", "心理健康是指...")
-        assert score3 == 0.0
-
-    def test_calculate_relevance_empty_query(self, temp_knowledge_base: Path):
-        """测试空查询的相关性计算。"""
+    def test_reload_invalidates_result_cache(self, temp_knowledge_base: Path):
+        """测试重新加载知识库后清空检索缓存，重新检索的结果不变。"""
         retriever = KnowledgeBaseRetriever(
             knowledge_base_path=str(temp_knowledge_base),
         )
 
-        score = retriever._calculate_relevance("", "内容")
-        assert score == 0.0
+        before = retriever.retrieve("心理健康 压力")
+        assert retriever._result_cache
+
+        retriever._load_knowledge_base()
+        assert not retriever._result_cache
+
+        after = retriever.retrieve("心理健康 压力")
+        assert after == before
+        assert all(a is not b for a, b in zip(before, after))
+
+    @pytest.mark.parametrize("query", ["", "   ", "量子物理 相对论"])
+    def test_retrieve_without_results(
+        self, retriever: KnowledgeBaseRetriever, query: str
+    ):
+        """测试空查询和完全不相关的查询返回空列表。"""
+        assert retriever.retrieve(query) == []
+
+    @pytest.mark.parametrize(
+        "query", ["心理健康", "压力 道家", "CBT", "cbt 情绪", "无为", "量子物理"]
+    )
+    def test_retrieve_matches_full_scan(
+        self, retriever: KnowledgeBaseRetriever, query: str
+    ):
+        """测试倒排索引检索结果与逐文档扫描一致。"""
+        expected = [
+            doc["source"]
+            for docs in retriever._knowledge_cache.values()
+            for doc in docs
+            if retriever._calculate_relevance(query.lower(), doc["content"]) > 0
+        ]
+
+        results = retriever.retrieve(query, top_k=10)
+        assert sorted(r.source for r in results) == sorted(expected)
+
+    @pytest.mark.parametrize(
+        "query, content, expected",
+        [
+            ("心理健康", "心理健康是指...", 1.0),  # 完全匹配
+            ("心理 健康", "心理健康是指...", 1.0),  # 每个词都出现
+            ("心理 焦虑", "心理健康是指...", 0.5),  # 部分匹配
+            ("abc xyz", "心理健康是指...", 0.0),  # 无匹配
+            ("", "内容", 0.0),  # 空查询
+        ],
+    )
+    def test_calculate_relevance(
+        self,
+        retriever: KnowledgeBaseRetriever,
+        query: str,
+        content: str,
+        expected: float,
+    ):
+        """测试相关性计算。"""
+        assert retriever._calculate_relevance(query, content) == expected
 
-    def test_extract_relevant_section(self, temp_knowledge_base: Path):
+    def test_extract_relevant_section(self, retriever: KnowledgeBaseRetriever):
         """测试提取相关段落。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
         content = (
             "第一段内容。\n"
             "第二段内容。\n"
@@ -224,12 +234,22 @@ class TestKnowledgeBaseRetriever:
         assert "关键词" in section
         assert isinstance(section, str)
 
-    def test_extract_relevant_section_no_match(self, temp_knowledge_base: Path):
-        """测试无匹配时返回文档开头。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
+    def test_extract_relevant_section_uses_earliest_match(
+        self, retriever: KnowledgeBaseRetriever
+    ):
+        """测试以任一查询词最早出现的位置为中心截取段落。"""
+        content = "前言" * 20 + "焦虑" + "正文" * 20 + "压力" + "结尾" * 20
+
+        section = retriever._extract_relevant_section(
+            content, "压力 焦虑", context_chars=20
         )
 
+        assert section.startswith("...")
+        assert "焦虑" in section
+        assert "压力" not in section
+
+    def test_extract_relevant_section_no_match(self, retriever: KnowledgeBaseRetriever):
+        """测试无匹配时返回文档开头。"""
         content = "这是文档的开头内容。后面还有其他内容。"
 
         section = retriever._extract_relevant_section(content, "不存在的关键词")
@@ -237,63 +257,53 @@ class TestKnowledgeBaseRetriever:
         # 应该返回文档开头
         assert "开头" in section
 
-    def test_get_knowledge_by_category(self, temp_knowledge_base: Path):
+    def test_get_knowledge_by_category(self, retriever: KnowledgeBaseRetriever):
         """测试按类别获取知识。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
         docs = retriever.get_knowledge_by_category("psychology_basics")
 
         assert len(docs) == 2
         assert all(d["category"] == "psychology_basics" for d in docs)
 
-    def test_get_knowledge_by_category_not_exists(self, temp_knowledge_base: Path):
+    def test_get_knowledge_by_category_not_exists(
+        self, retriever: KnowledgeBaseRetriever
+    ):
         """测试获取不存在的类别。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
         docs = retriever.get_knowledge_by_category("nonexistent_category")
 
         assert docs == []
 
-    def test_list_categories(self, temp_knowledge_base: Path):
+    def test_list_categories(self, retriever: KnowledgeBaseRetriever):
         """测试列出所有类别。"""
-        retriever = KnowledgeBaseRetriever(
-            knowledge_base_path=str(temp_knowledge_base),
-        )
-
         categories = retriever.list_categories()
 
         assert isinstance(categories, list)
         assert len(categories) == 3
 
+    def test_reload_does_not_duplicate_documents(self, temp_knowledge_base: Path):
+        """测试重新加载知识库后索引重建，文档不会重复。"""
+        retriever = KnowledgeBaseRetriever(
+            knowledge_base_path=str(temp_knowledge_base),
+            top_k=10,
+        )
+        doc_count = len(retriever._docs)
 
-class TestKnowledgeBaseRetrieverSingleton:
-    """测试知识库检索器单例模式。"""
-
-    @pytest.fixture
-    def temp_knowledge_base(self) -> Generator[Path, None, None]:
-        """创建临时知识库目录。"""
-        temp_dir = tempfile.mkdtemp()
-        knowledge_base = Path(temp_dir) / "knowledge_base"
+        retriever._load_knowledge_base()
 
-        (knowledge_base / "psychology_basics").mkdir(parents=True)
-        (knowledge_base / "psychology_basics" / "test.md").write_text(
-            "测试内容", encoding="utf-8"
-        )
+        sources = [r.source for r in retriever.retrieve("心理")]
+        assert len(retriever._docs) == doc_count
+        assert len(sources) == len(set(sources))
+        assert len(retriever.get_knowledge_by_category("psychology_basics")) == 2
 
-        yield knowledge_base
 
-        shutil.rmtree(temp_dir)
+class TestKnowledgeBaseRetrieverSingleton:
+    """测试知识库检索器单例模式。"""
 
-    def test_singleton_pattern(self, temp_knowledge_base: Path):
+    def test_singleton_pattern(
+        self, temp_knowledge_base: Path, monkeypatch: pytest.MonkeyPatch
+    ):
         """测试单例模式。"""
-        # 重置全局实例
-        import src.tools.rag
-
-        src.tools.rag._retriever = None
+        # 重置全局实例，测试结束后自动恢复
+        monkeypatch.setattr(rag_module, "_retriever", None)
 
         retriever1 = get_knowledge_retriever(
             knowledge_base_path=str(temp_knowledge_base)
@@ -304,12 +314,12 @@ class TestKnowledgeBaseRetrieverSingleton:
 
         assert retriever1 is retriever2
 
-    def test_singleton_reinitialization(self, temp_knowledge_base: Path):
+    def test_singleton_reinitialization(
+        self, temp_knowledge_base: Path, monkeypatch: pytest.MonkeyPatch
+    ):
         """测试单例不会被重新初始化。"""
-        # 重置全局实例
-        import src.tools.rag
-
-        src.tools.rag._retriever = None
+        # 重置全局实例，测试结束后自动恢复
+        monkeypatch.setattr(rag_module, "_retriever", None)
 
         # 首先通过 get_knowledge_retriever 创建实例
         retriever1 = get_knowledge_retriever(